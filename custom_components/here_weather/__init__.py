@@ -2,52 +2,182 @@
 # pyright: reportGeneralTypeIssues=false
 from __future__ import annotations
 
-import copy
+import asyncio
 import logging
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
 
 import aiohere
+import aiohttp
 from aiohere.model.astronomy import AstronomyForecasts
 import async_timeout
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_API_KEY,
     CONF_LATITUDE,
     CONF_LONGITUDE,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util.dt import as_utc, parse_datetime
+import homeassistant.util.dt as dt_util
 
-from custom_components.here_weather.utils import combine_utc_and_local
+from custom_components.here_weather.utils import (
+    combine_utc_and_local,
+    get_locations,
+    get_offsets,
+    get_unique_id,
+    get_refresh_phase,
+    next_aligned_time,
+    parse_here_datetime_as_utc,
+)
 
 from .const import (
     CONF_LANGUAGE,
+    CONF_LOCATION_PRECISION,
+    CONF_MAX_CONCURRENT_FETCHES,
+    CONF_MAX_CONCURRENT_SETUPS,
+    CONF_MAX_STALENESS,
     CONF_MODES,
+    CONF_MONTHLY_QUOTA,
+    CONF_NOWCAST,
+    CONF_NOWCAST_INTERPOLATE,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SCAN_INTERVALS,
+    DATA_FETCHER,
+    DATA_SESSION,
+    DATA_RATE_LIMIT_CONFIG,
+    DATA_SETUP_SEMAPHORE,
     DEFAULT_LANGUAGE,
-    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
+    DEFAULT_MAX_CONCURRENT_SETUPS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MODE,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_SCAN_INTERVALS,
     DOMAIN,
     LANGUAGES,
+    MODE_ASTRONOMY,
+    MODE_HOURLY,
+    NOWCAST_INTERPOLATION_MINUTES,
+    PAYLOAD_KEYS,
+    SENSOR_TYPES,
     STARTUP_MESSAGE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .circuit_breaker import (
+    HERECircuitBreaker,
+    async_get_circuit_breaker,
+    backoff_delay,
 )
+from .instrumentation import HEREWeatherModeStatistics
+from .model import (
+    HEREWeatherFetchResult,
+    HEREWeatherRecord,
+    HEREWeatherTimeIndex,
+    diff_records,
+    value_table,
+)
+from .services import async_setup_services
+from .rate_limit import HERERateLimiter, async_get_rate_limiter
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "weather"]
 
+# Modes expiring within this window are fetched together with the due ones.
+# It also absorbs the jitter of the refresh timer.
+DUE_TOLERANCE = timedelta(seconds=30)
+
+# A location whose request failed is retried after this delay at the earliest
+# while the other locations of the entry keep their own schedule. Invalid
+# requests of a location back off up to MAX_FAILED_LOCATION_RETRY.
+FAILED_LOCATION_RETRY = timedelta(minutes=5)
+MAX_FAILED_LOCATION_RETRY = timedelta(hours=6)
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_SETUPS, default=DEFAULT_MAX_CONCURRENT_SETUPS
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_FETCHES, default=DEFAULT_MAX_CONCURRENT_FETCHES
+                ): cv.positive_int,
+                vol.Optional(CONF_LOCATION_PRECISION): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=6)
+                ),
+                vol.Optional(
+                    CONF_REQUESTS_PER_MINUTE, default=DEFAULT_REQUESTS_PER_MINUTE
+                ): cv.positive_int,
+                vol.Optional(CONF_MONTHLY_QUOTA): cv.positive_int,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the here_weather component."""
+    domain_config = config.get(DOMAIN, {})
+    hass.data[DATA_SETUP_SEMAPHORE] = asyncio.Semaphore(
+        domain_config.get(CONF_MAX_CONCURRENT_SETUPS, DEFAULT_MAX_CONCURRENT_SETUPS)
+    )
+    hass.data[DATA_RATE_LIMIT_CONFIG] = domain_config
+    hass.data[DATA_FETCHER] = HEREWeatherFetcher(
+        domain_config.get(CONF_MAX_CONCURRENT_FETCHES, DEFAULT_MAX_CONCURRENT_FETCHES),
+        domain_config.get(CONF_LOCATION_PRECISION),
+    )
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up here_weather from a config entry."""
     if hass.data.get(DOMAIN) is None:
         _LOGGER.info(STARTUP_MESSAGE)
     migrate_entry_v1(hass, entry)
-    here_weather_coordinators = {}
-    for mode in CONF_MODES:
-        coordinator = HEREWeatherDataUpdateCoordinator(hass, entry, mode)
+    rate_limiter = await async_get_rate_limiter(hass, entry.data[CONF_API_KEY])
+    coordinator = HEREWeatherDataUpdateCoordinator(
+        hass,
+        entry,
+        rate_limiter,
+        async_get_circuit_breaker(hass, entry.data[CONF_API_KEY]),
+    )
+    setup_semaphore: asyncio.Semaphore = hass.data.setdefault(
+        DATA_SETUP_SEMAPHORE, asyncio.Semaphore(DEFAULT_MAX_CONCURRENT_SETUPS)
+    )
+    await coordinator.async_load_cache()
+    async with setup_semaphore:
         await coordinator.async_config_entry_first_refresh()
-        here_weather_coordinators[mode] = coordinator
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = here_weather_coordinators
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if entry.options.get(CONF_NOWCAST, False):
+        entry.async_on_unload(
+            async_track_time_change(
+                hass,
+                coordinator.async_nowcast,
+                minute=(
+                    f"/{NOWCAST_INTERPOLATION_MINUTES}"
+                    if entry.options.get(CONF_NOWCAST_INTERPOLATE, False)
+                    else 0
+                ),
+                second=0,
+            )
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -58,63 +188,703 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        for latitude, longitude in coordinator.locations.values():
+            hass.data[DATA_FETCHER].async_forget(latitude, longitude)
 
     return unload_ok  # type: ignore
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached payloads of a config entry."""
+    for location in get_locations(entry):
+        await async_remove_location_stores(hass, entry.entry_id, location)
+
+
 def migrate_entry_v1(hass: HomeAssistant, entry: ConfigEntry) -> None:
     if (language := entry.options.get(CONF_LANGUAGE)) is not None:
         if language not in LANGUAGES.keys():
-            hass.config_entries.async_update_entry(entry, options={})
+            hass.config_entries.async_update_entry(
+                entry,
+                options={
+                    key: value
+                    for key, value in entry.options.items()
+                    if key != CONF_LANGUAGE
+                },
+            )
             _LOGGER.warning(
                 "The configured language was reset. Please configure it again."
             )
 
 
 class HEREWeatherDataUpdateCoordinator(DataUpdateCoordinator):
-    """Get the latest data from HERE."""
+    """Get the latest data for all locations and modes of an entry from HERE.
+
+    The data is an index from (location_id, mode) to the parsed records. The
+    entities use that key as listener context and skip writing their state
+    if the values they show did not change. For the sensors, the attributes
+    of every (location_id, mode) are also published in values, indexed by
+    (attribute, offset), and for lookups by time in time_indexes. Each
+    location is fetched with a single request for all its due modes. If a
+    refresh fails, the last data of a mode is still served until it is
+    overdue by more than the max staleness. With
+    nowcast enabled, the hourly forecast starts at the current hour and is
+    rolled forward between requests.
+    """
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, mode: str) -> None:
+    data: dict[tuple[str, str], list[HEREWeatherRecord]] | None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        rate_limiter: HERERateLimiter,
+        circuit_breaker: HERECircuitBreaker,
+    ) -> None:
         """Initialize the data object."""
-        session = async_get_clientsession(hass)
+        session = async_get_session(hass)
         self.here_client = aiohere.AioHere(entry.data[CONF_API_KEY], session=session)
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
         self.language = LANGUAGES[entry.options.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)]
-        self.latitude = entry.data[CONF_LATITUDE]
-        self.longitude = entry.data[CONF_LONGITUDE]
-        self.weather_product_type = aiohere.WeatherProductType[mode]
+        self._nowcast: bool = entry.options.get(CONF_NOWCAST, False)
+        self._nowcast_interpolate: bool = entry.options.get(
+            CONF_NOWCAST_INTERPOLATE, False
+        )
+        self._max_staleness = timedelta(
+            minutes=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        )
+        self.locations = {
+            get_unique_id(location): (location[CONF_LATITUDE], location[CONF_LONGITUDE])
+            for location in get_locations(entry)
+        }
+        self._stores = {
+            (location_id, mode): async_get_mode_store(
+                hass, entry.entry_id, location_id, mode
+            )
+            for location_id in self.locations
+            for mode in CONF_MODES
+        }
+        self._intervals = {
+            mode: timedelta(
+                minutes=entry.options.get(
+                    CONF_SCAN_INTERVALS[mode], DEFAULT_SCAN_INTERVALS[mode]
+                )
+            )
+            for mode in CONF_MODES
+        }
+        # Entries refresh at their own offset instead of all at the same time
+        self._phase = get_refresh_phase(entry.entry_id, min(self._intervals.values()))
+        self._fetcher: HEREWeatherFetcher = hass.data.setdefault(
+            DATA_FETCHER, HEREWeatherFetcher(DEFAULT_MAX_CONCURRENT_FETCHES)
+        )
+        self._fetched: dict[tuple[str, str], datetime] = {}
+        self._retry_after: dict[str, datetime] = {}
+        self._invalid_requests: dict[str, int] = {}
+        self._changes: dict[tuple[str, str], set[tuple[int, str]]] = {}
+        # The records as fetched, before the hourly ones are rolled forward
+        self._records: dict[tuple[str, str], list[HEREWeatherRecord]] = {}
+        self.values: dict[
+            tuple[str, str], dict[tuple[str, int], str | float | datetime | None]
+        ] = {}
+        # Only the values sensors can be created for are kept. The options
+        # they depend on reload the entry when they change.
+        self._value_keys = {
+            mode: [
+                (name, offset)
+                for offset in get_offsets(entry, mode)
+                for name in SENSOR_TYPES[mode]
+            ]
+            for mode in CONF_MODES
+        }
+        self.time_indexes: dict[tuple[str, str], HEREWeatherTimeIndex] = {}
+        self.statistics = {mode: HEREWeatherModeStatistics() for mode in CONF_MODES}
+        self._cached_payloads: dict[tuple[str, str], dict] = {}
+        self._initially_enabled_contexts: set[
+            tuple[str, str]
+        ] = async_get_enabled_contexts(hass, entry)
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=min(self._intervals.values()),
+        )
+
+    async def async_load_cache(self) -> None:
+        """Seed the coordinator with the payloads stored during the last run."""
+        cached_contexts = await asyncio.gather(
+            *(store.async_load() for store in self._stores.values())
+        )
+        for context, cached in zip(self._stores, cached_contexts, strict=True):
+            if cached is None or cached["language"] != self.language:
+                continue
+            if (fetched := dt_util.parse_datetime(cached["fetched"])) is None:
+                continue
+            self._fetched[context] = fetched
+            self._cached_payloads[context] = cached["payload"]
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates of the (location_id, mode) given as context.
+
+        A mode that has not been fetched yet is requested as soon as the
+        first entity using it is added.
+        """
+        remove_listener: Callable[[], None] = super().async_add_listener(
+            update_callback, context
         )
+        if self.data is not None and context is not None and context not in self.data:
+            self.hass.async_create_task(self.async_request_refresh())
+        return remove_listener
+
+    @callback
+    def async_has_changed(
+        self, context: tuple[str, str], value: tuple[int, str] | None = None
+    ) -> bool:
+        """Return if the last update changed the data of a (location_id, mode).
+
+        With value given as (offset, name), only that value is considered.
+        """
+        if (changes := self._changes.get(context)) is None:
+            return False
+        if value is None:
+            return bool(changes)
+        return value in changes
+
+    @callback
+    def async_data_age(self, context: tuple[str, str]) -> timedelta | None:
+        """Return the age of the data of a (location_id, mode) if it is stale.
+
+        Data is stale once it is due to be fetched again.
+        """
+        if (fetched := self._fetched.get(context)) is None:
+            return None
+        now: datetime = dt_util.utcnow()
+        if now < self._stale_since(context):
+            return None
+        return now - fetched
+
+    @callback
+    def async_is_servable(self, context: tuple[str, str]) -> bool:
+        """Return if the data of a (location_id, mode) is within max staleness."""
+        return self._is_servable(context, dt_util.utcnow())
+
+    def _is_servable(self, context: tuple[str, str], now: datetime) -> bool:
+        """Return if the data of a (location_id, mode) may be served at now."""
+        if context not in self._fetched:
+            return False
+        return now <= self._stale_since(context) + self._max_staleness
+
+    def _active_contexts(self) -> set[tuple[str, str]]:
+        """Return the (location_id, mode) used by at least one enabled entity."""
+        if self.data is None:
+            return self._initially_enabled_contexts
+        active_contexts: set[tuple[str, str]] = set(self.async_contexts())
+        return active_contexts
+
+    def _stale_since(self, context: tuple[str, str]) -> datetime:
+        """Return when the data of a (location_id, mode) is due to be fetched."""
+        return self._next_refresh(self._fetched[context], context[1])
+
+    def _next_refresh(self, fetched: datetime, mode: str) -> datetime:
+        """Return when data of mode fetched at fetched is due to be fetched again."""
+        return next_aligned_time(
+            fetched + DUE_TOLERANCE, self._intervals[mode], self._phase
+        )
+
+    def _expiry(self, context: tuple[str, str]) -> datetime:
+        """Return when the data of a (location_id, mode) has to be fetched again."""
+        expiry = self._stale_since(context)
+        if (retry_after := self._retry_after.get(context[0])) is not None:
+            return max(expiry, retry_after)
+        return expiry
+
+    def _due_contexts(self, now: datetime) -> list[tuple[str, str]]:
+        """Return the (location_id, mode) whose data is missing or expired.
+
+        The refresh timer is scheduled for the next expiry. If a refresh
+        happens before anything expired, e.g. because it was requested
+        manually, the modes expiring next are fetched early.
+        """
+        active_contexts = self._active_contexts()
+        expiries = {
+            context: self._expiry(context)
+            for context in self._fetched
+            if context in active_contexts
+        }
+        due_contexts = [
+            context
+            for context in sorted(active_contexts)
+            if (
+                expiries[context]
+                if context in expiries
+                else self._retry_after.get(context[0], now)
+            )
+            <= now + DUE_TOLERANCE
+        ]
+        if due_contexts or self.data is None or not expiries:
+            return due_contexts
+        next_expiry = min(expiries.values())
+        return [
+            context
+            for context, expiry in expiries.items()
+            if expiry <= next_expiry + DUE_TOLERANCE
+        ]
+
+    def _time_until_next_fetch(self, now: datetime) -> timedelta:
+        """Return the time until the data of the next active mode expires."""
+        active_contexts = self._active_contexts()
+        expiries = [
+            self._expiry(context)
+            for context in active_contexts
+            if context in self._fetched
+        ] + [
+            self._retry_after[location_id]
+            for location_id, _ in active_contexts
+            if location_id in self._retry_after
+        ]
+        # Entities of failing locations become unavailable once max staleness
+        # is exceeded, which needs an update even if no retry is due
+        expiries += [
+            servable_until
+            for context in active_contexts
+            if context[0] in self._retry_after
+            and context in self._fetched
+            and (servable_until := self._stale_since(context) + self._max_staleness)
+            > now
+        ]
+        if not expiries:
+            return min(self._intervals.values())
+        return max(min(expiries) - now, DUE_TOLERANCE)
 
     async def _async_update_data(
         self,
-    ) -> list[dict[str, str | float | datetime | None]]:
+    ) -> dict[tuple[str, str], list[HEREWeatherRecord]]:
         """Perform data update."""
+        now = dt_util.utcnow()
+        self._changes = {}
+        data = dict(self._records)
+        data.update(self._parse_cached_payloads())
+        modes_by_location: dict[str, list[str]] = {}
+        for location_id, mode in self._due_contexts(now):
+            modes_by_location.setdefault(location_id, []).append(mode)
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_location(location_id, modes, now)
+                for location_id, modes in modes_by_location.items()
+            ),
+            return_exceptions=True,
+        )
+        errors: list[BaseException] = []
+        for location_id, result in zip(modes_by_location, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, aiohere.HereError | asyncio.TimeoutError):
+                    raise result
+                self._retry_after[location_id] = self._retry_time(
+                    location_id, result, now
+                )
+                errors.append(result)
+                continue
+            self._retry_after.pop(location_id, None)
+            self._invalid_requests.pop(location_id, None)
+            data.update(result)
+        # Failed locations are retried on their own schedule even if all failed
+        self.update_interval = self._time_until_next_fetch(now)
+        # Entities check if their own data is servable, so the update only
+        # fails if nothing of the entry can be served anymore
+        if errors and not any(
+            self._is_servable(context, now) for context in self._active_contexts()
+        ):
+            if isinstance(error := errors[0], aiohere.HereError):
+                raise UpdateFailed(
+                    f"Unable to fetch data from HERE: {error.args[0]}"
+                ) from error
+            raise error
+        return self._async_index(data, now)
+
+    @callback
+    def async_nowcast(self, now: datetime) -> None:
+        """Roll the hourly forecast forward without requesting HERE."""
+        if self.data is None:
+            return
+        self.data = self._async_index(self._records, dt_util.utcnow())
+        self.async_update_listeners()
+
+    def _async_index(
+        self, records: dict[tuple[str, str], list[HEREWeatherRecord]], now: datetime
+    ) -> dict[tuple[str, str], list[HEREWeatherRecord]]:
+        """Return the data for the fetched records and index what changed."""
+        for context, context_records in records.items():
+            if self._records.get(context) is not context_records:
+                self.time_indexes[context] = HEREWeatherTimeIndex(context_records)
+        self._records = records
+        data = dict(records)
+        if self._nowcast:
+            for context in data:
+                if context[1] == MODE_HOURLY:
+                    data[context] = self.time_indexes[context].roll_forward(
+                        now, self._nowcast_interpolate
+                    )
+        previous = self.data or {}
+        self._changes = {
+            context: diff_records(previous.get(context), context_records)
+            for context, context_records in data.items()
+            if previous.get(context) is not context_records
+        }
+        for context, changes in self._changes.items():
+            value_keys = self._value_keys[context[1]]
+            if context not in self.values or any(
+                (offset, name) in changes for name, offset in value_keys
+            ):
+                self.values[context] = value_table(data[context], value_keys)
+        return data
+
+    def _retry_time(
+        self, location_id: str, error: BaseException, now: datetime
+    ) -> datetime:
+        """Return when a location whose request failed is fetched again.
+
+        Invalid requests concern only the location and back off on their
+        own. Other errors wait for the circuit breaker of the API key.
+        """
+        if isinstance(error, aiohere.HereInvalidRequestError):
+            attempt = self._invalid_requests.get(location_id, 0) + 1
+            self._invalid_requests[location_id] = attempt
+            return now + backoff_delay(
+                FAILED_LOCATION_RETRY, attempt, MAX_FAILED_LOCATION_RETRY
+            )
+        retry_time = now + FAILED_LOCATION_RETRY
+        if (retry_at := self.circuit_breaker.retry_at) is not None:
+            return max(retry_time, retry_at)
+        return retry_time
+
+    def _parse_cached_payloads(
+        self,
+    ) -> dict[tuple[str, str], list[HEREWeatherRecord]]:
+        """Parse the payloads loaded from the cache."""
+        data = {}
+        for context, payload in self._cached_payloads.items():
+            try:
+                data[context] = extract_data_from_payload_for_product_type(
+                    payload, aiohere.WeatherProductType[context[1]]  # type: ignore[arg-type]
+                )
+            except (KeyError, IndexError, TypeError, UpdateFailed):
+                _LOGGER.debug("Discarding invalid cached payload for %s", context)
+                self._fetched.pop(context)
+        self._cached_payloads.clear()
+        return data
+
+    async def _async_fetch_location(
+        self, location_id: str, modes: list[str], now: datetime
+    ) -> dict[tuple[str, str], list[HEREWeatherRecord]]:
+        """Fetch the given modes of a location through the shared fetcher."""
+        latitude, longitude = self.locations[location_id]
+
+        def _is_usable(mode: str, fetched: datetime) -> bool:
+            """Return if a result fetched for a nearby location can be used."""
+            own_fetched = self._fetched.get((location_id, mode))
+            if own_fetched is not None and fetched <= own_fetched:
+                return False
+            return self._next_refresh(fetched, mode) > now + DUE_TOLERANCE
+
         try:
-            async with async_timeout.timeout(10):
-                return await self._get_data()
-        except aiohere.HereError as error:
-            raise UpdateFailed(
-                f"Unable to fetch data from HERE: {error.args[0]}"
-            ) from error
-
-    async def _get_data(self) -> list[dict[str, str | float | datetime | None]]:
-        """Get the latest data from HERE."""
-        data = await self.here_client.weather_for_coordinates(
-            self.latitude,
-            self.longitude,
-            [self.weather_product_type],
-            language=self.language,
+            results, payloads = await self._fetcher.async_fetch(
+                self.here_client,
+                self.rate_limiter,
+                self.circuit_breaker,
+                latitude,
+                longitude,
+                modes,
+                self.language,
+                _is_usable,
+            )
+        except (aiohere.HereError, asyncio.TimeoutError) as error:
+            _LOGGER.warning(
+                "Unable to fetch data for %s from HERE: %s", location_id, error
+            )
+            for mode in modes:
+                self.statistics[mode].record_failure(now, error)
+            raise
+        data = {}
+        for mode, result in results.items():
+            context = (location_id, mode)
+            data[context] = result.records
+            if self._fetched.get(context) != result.fetched:
+                self._fetched[context] = result.fetched
+                # Results requested by another entry are not cached for this one
+                if (payload := payloads.get(mode)) is not None:
+                    self._async_save_payload(context, payload)
+                self.statistics[mode].record_success(
+                    result.fetched,
+                    result.latency,
+                    result.parse_time,
+                    len(result.records),
+                    result.response_size,
+                )
+        return data
+
+    @callback
+    def _async_save_payload(self, context: tuple[str, str], payload: dict) -> None:
+        """Schedule writing the payload of a (location_id, mode) to the cache."""
+        cached = {
+            "language": self.language,
+            "fetched": self._fetched[context].isoformat(),
+            "payload": payload,
+        }
+        self._stores[context].async_delay_save(lambda: cached, STORAGE_SAVE_DELAY)
+
+
+# Sizes of the response bodies read by the request of the current task
+_response_sizes: ContextVar[list[int] | None] = ContextVar(
+    "response_sizes", default=None
+)
+
+
+async def _async_on_response_chunk_received(
+    _session: aiohttp.ClientSession,
+    _context: SimpleNamespace,
+    params: aiohttp.TraceResponseChunkReceivedParams,
+) -> None:
+    """Record the size of a response body read by a request of the fetcher."""
+    if (response_sizes := _response_sizes.get()) is not None:
+        response_sizes.append(len(params.chunk))
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the session for HERE, which measures the size of the responses."""
+    session: aiohttp.ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is None:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_response_chunk_received.append(
+            _async_on_response_chunk_received  # type: ignore[arg-type]
         )
-        _LOGGER.debug("Raw response is: %s", data)
-        return extract_data_from_payload_for_product_type(
-            data, self.weather_product_type
+        session = hass.data[DATA_SESSION] = async_create_clientsession(
+            hass, trace_configs=[trace_config]
         )
+    return session
+
+
+class HEREWeatherFetcher:
+    """Fetch HERE payloads for the locations of all entries.
+
+    Requests are limited by a semaphore and pass the rate limiter and the
+    circuit breaker of their API key. Locations falling into the same
+    spatial bucket share the requests and the parsed results of each mode.
+    Without a precision only locations with equal coordinates do.
+    """
+
+    def __init__(self, max_concurrent_fetches: int, precision: int | None = None):
+        """Initialize the fetcher."""
+        self._semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        self._precision = precision
+        self._results: dict[tuple[float, float, str, str], HEREWeatherFetchResult] = {}
+        self._pending: dict[
+            tuple[float, float, str, str], asyncio.Future[HEREWeatherFetchResult]
+        ] = {}
+
+    def bucket(self, latitude: float, longitude: float) -> tuple[float, float]:
+        """Return the coordinates requested for all locations of a bucket."""
+        if self._precision is None:
+            return latitude, longitude
+        return round(latitude, self._precision), round(longitude, self._precision)
+
+    async def async_fetch(
+        self,
+        here_client: aiohere.AioHere,
+        rate_limiter: HERERateLimiter,
+        circuit_breaker: HERECircuitBreaker,
+        latitude: float,
+        longitude: float,
+        modes: list[str],
+        language: str,
+        is_usable: Callable[[str, datetime], bool],
+    ) -> tuple[dict[str, HEREWeatherFetchResult], dict[str, dict[str, Any]]]:
+        """Return the results of the given modes for a location.
+
+        Usable results of the bucket are reused and requests in flight for it
+        are awaited. Only the remaining modes are requested, the payload
+        sections of these are returned alongside the results.
+        """
+        bucket = self.bucket(latitude, longitude)
+        results: dict[str, HEREWeatherFetchResult] = {}
+        pending: dict[str, asyncio.Future[HEREWeatherFetchResult]] = {}
+        to_request: list[str] = []
+        for mode in modes:
+            key = (*bucket, mode, language)
+            if (result := self._results.get(key)) is not None and is_usable(
+                mode, result.fetched
+            ):
+                results[mode] = result
+            elif (future := self._pending.get(key)) is not None:
+                pending[mode] = future
+            else:
+                to_request.append(mode)
+        payloads: dict[str, dict[str, Any]] = {}
+        if to_request:
+            requested, payloads = await self._async_request(
+                here_client,
+                rate_limiter,
+                circuit_breaker,
+                bucket,
+                to_request,
+                language,
+            )
+            results.update(requested)
+        for mode, future in pending.items():
+            results[mode] = await asyncio.shield(future)
+        return results, payloads
+
+    @callback
+    def async_forget(self, latitude: float, longitude: float) -> None:
+        """Drop the results kept for the bucket of a location."""
+        bucket = self.bucket(latitude, longitude)
+        for key in [key for key in self._results if key[:2] == bucket]:
+            del self._results[key]
+
+    async def _async_request(
+        self,
+        here_client: aiohere.AioHere,
+        rate_limiter: HERERateLimiter,
+        circuit_breaker: HERECircuitBreaker,
+        bucket: tuple[float, float],
+        modes: list[str],
+        language: str,
+    ) -> tuple[dict[str, HEREWeatherFetchResult], dict[str, dict[str, Any]]]:
+        """Request the given modes of a bucket with a single request.
+
+        The payload sections are only returned to the caller to be cached and
+        are not kept with the shared results.
+        """
+        loop = asyncio.get_running_loop()
+        futures: dict[str, asyncio.Future[HEREWeatherFetchResult]] = {
+            mode: loop.create_future() for mode in modes
+        }
+        for mode, future in futures.items():
+            self._pending[(*bucket, mode, language)] = future
+        try:
+            circuit_breaker.async_before_request()
+            try:
+                # Throttling must not hold a slot of the fetches of all entries
+                await rate_limiter.async_acquire()
+                async with self._semaphore, async_timeout.timeout(10):
+                    start = time.perf_counter()
+                    response_sizes: list[int] = []
+                    token = _response_sizes.set(response_sizes)
+                    try:
+                        data = await here_client.weather_for_coordinates(
+                            *bucket,
+                            [aiohere.WeatherProductType[mode] for mode in modes],
+                            language=language,
+                        )
+                    finally:
+                        _response_sizes.reset(token)
+                    latency = time.perf_counter() - start
+            except BaseException as error:
+                circuit_breaker.async_record_failure(error)
+                raise
+            circuit_breaker.async_record_success()
+            fetched = dt_util.utcnow()
+            _LOGGER.debug("Fetched %s for %s in %.3f s", modes, bucket, latency)
+            results = {}
+            payloads = {}
+            for mode in modes:
+                start = time.perf_counter()
+                records = extract_data_from_payload_for_product_type(
+                    data, aiohere.WeatherProductType[mode]
+                )
+                parse_time = time.perf_counter() - start
+                payloads[mode] = {PAYLOAD_KEYS[mode]: data[PAYLOAD_KEYS[mode]]}  # type: ignore[literal-required]
+                results[mode] = HEREWeatherFetchResult(
+                    fetched=fetched,
+                    records=records,
+                    latency=latency,
+                    parse_time=parse_time,
+                    response_size=sum(response_sizes) if response_sizes else None,
+                )
+        except BaseException as error:
+            for future in futures.values():
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+                    # Only requests for the same bucket in flight retrieve it
+                    future.exception()
+            raise
+        finally:
+            for mode in modes:
+                self._pending.pop((*bucket, mode, language), None)
+        for mode, result in results.items():
+            self._results[(*bucket, mode, language)] = result
+            futures[mode].set_result(result)
+        return results, payloads
+
+
+@callback
+def async_get_enabled_contexts(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> set[tuple[str, str]]:
+    """Return the (location_id, mode) with an enabled entity in the entity registry.
+
+    Entities which are not registered yet count as enabled if they are
+    enabled by default.
+    """
+    registry = er.async_get(hass)
+
+    def _is_enabled(platform: str, unique_id: str, enabled_default: bool) -> bool:
+        if (
+            entity_id := registry.async_get_entity_id(platform, DOMAIN, unique_id)
+        ) is None:
+            return enabled_default
+        return not registry.entities[entity_id].disabled
+
+    enabled_contexts = set()
+    for location in get_locations(entry):
+        for mode, weather_attributes in SENSOR_TYPES.items():
+            if (
+                mode != MODE_ASTRONOMY
+                and _is_enabled(
+                    "weather", get_unique_id(location, mode), mode == DEFAULT_MODE
+                )
+            ) or any(
+                _is_enabled(
+                    "sensor",
+                    get_unique_id(location, mode, weather_attribute["name"], offset),
+                    False,
+                )
+                for weather_attribute in weather_attributes.values()
+                for offset in get_offsets(entry, mode)
+            ):
+                enabled_contexts.add((get_unique_id(location), mode))
+    return enabled_contexts
+
+
+@callback
+def async_get_mode_store(
+    hass: HomeAssistant, entry_id: str, location_id: str, mode: str
+) -> Store:
+    """Return the store caching the payload of a mode of a location of an entry."""
+    return Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.{location_id}.{mode.lower()}"
+    )
+
+
+async def async_remove_location_stores(
+    hass: HomeAssistant, entry_id: str, location: Mapping[str, Any]
+) -> None:
+    """Remove the cached payloads of all modes of a location of an entry."""
+    for mode in CONF_MODES:
+        await async_get_mode_store(
+            hass, entry_id, get_unique_id(location), mode
+        ).async_remove()
 
 
 def extract_data_from_payload_for_product_type(
@@ -124,8 +894,25 @@ def extract_data_from_payload_for_product_type(
     | aiohere.HourlyResponse
     | aiohere.ObservationResponse,
     product_type: aiohere.WeatherProductType,
-) -> list[dict[str, str | float | datetime | None]]:
-    """Extract the actual data from the HERE payload."""
+) -> list[HEREWeatherRecord]:
+    """Extract the actual data from the HERE payload and parse it into records."""
+    return [
+        HEREWeatherRecord.from_element(element, product_type.name)
+        for element in extract_elements_from_payload_for_product_type(
+            data, product_type
+        )
+    ]
+
+
+def extract_elements_from_payload_for_product_type(
+    data: aiohere.AstronomyResponse
+    | aiohere.DailySimpleResponse
+    | aiohere.DailyResponse
+    | aiohere.HourlyResponse
+    | aiohere.ObservationResponse,
+    product_type: aiohere.WeatherProductType,
+) -> Iterator[dict[str, str | float | datetime | None]]:
+    """Extract the actual elements from the HERE payload."""
     if product_type == aiohere.WeatherProductType.FORECAST_ASTRONOMY:
         return parse_time_as_utc(astronomy_data(data["astronomyForecasts"][0]))  # type: ignore[typeddict-item]
     if product_type == aiohere.WeatherProductType.OBSERVATION:
@@ -141,35 +928,34 @@ def extract_data_from_payload_for_product_type(
 
 
 def parse_time_as_utc(
-    data: list[dict[str, str | float | datetime | None]]
-) -> list[dict[str, str | float | datetime | None]]:
-    """Parse time string to datetime objects."""
-    result = copy.deepcopy(data)
-    for element in result:
-        element["time"] = as_utc(parse_datetime(element["time"]))
-    return result
+    data: Iterable[Mapping[str, str | float | datetime | None]]
+) -> Iterator[dict[str, str | float | datetime | None]]:
+    """Yield shallow copies of the elements with their time parsed as UTC."""
+    for element in data:
+        yield {**element, "time": parse_here_datetime_as_utc(element["time"])}
 
 
 def astronomy_data(
     data: AstronomyForecasts,
-) -> list[dict[str, str | float | datetime | None]]:
-    """Restructure data for this integration."""
-    ammended_data: list[dict[str, str | float | datetime | None]] = copy.deepcopy(
-        data["forecasts"]  # type: ignore[arg-type]
-    )
-    for element in ammended_data:
-        element["city"] = data["place"]["address"]["city"]
-        element["latitude"] = data["place"]["location"]["lat"]
-        element["longitude"] = data["place"]["location"]["lng"]
-        element["sunRise"] = astronomy_data_with_utc("sunRise", element)
-        element["sunSet"] = astronomy_data_with_utc("sunSet", element)
-        element["moonRise"] = astronomy_data_with_utc("moonRise", element)
-        element["moonSet"] = astronomy_data_with_utc("moonSet", element)
-    return ammended_data
+) -> Iterator[dict[str, str | float | datetime | None]]:
+    """Yield shallow copies of the elements restructured for this integration."""
+    city = data["place"]["address"]["city"]
+    location = data["place"]["location"]
+    for element in data["forecasts"]:
+        yield {
+            **element,  # type: ignore[arg-type]
+            "city": city,
+            "latitude": location["lat"],
+            "longitude": location["lng"],
+            "sunRise": astronomy_data_with_utc("sunRise", element),  # type: ignore[arg-type]
+            "sunSet": astronomy_data_with_utc("sunSet", element),  # type: ignore[arg-type]
+            "moonRise": astronomy_data_with_utc("moonRise", element),  # type: ignore[arg-type]
+            "moonSet": astronomy_data_with_utc("moonSet", element),  # type: ignore[arg-type]
+        }
 
 
 def astronomy_data_with_utc(
-    key: str, data: dict[str, str | float | datetime | None]
+    key: str, data: Mapping[str, str | float | datetime | None]
 ) -> str | datetime | None:
     """Transform astronomy data to utc fields."""
     if (value := data.get(key)) is not None:
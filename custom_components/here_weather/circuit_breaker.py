@@ -0,0 +1,141 @@
+"""Circuit breaker pausing the requests made to HERE while they keep failing."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+import aiohere
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_CIRCUIT_BREAKERS
+from .rate_limit import HERERateLimitExceeded
+from .utils import get_api_key_id
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive transient failures opening the breaker
+FAILURE_THRESHOLD = 3
+TRANSIENT_RETRY = timedelta(minutes=1)
+MAX_TRANSIENT_RETRY = timedelta(hours=1)
+# A rejected API key will not start working by itself
+UNAUTHORIZED_RETRY = timedelta(hours=1)
+MAX_UNAUTHORIZED_RETRY = timedelta(days=1)
+
+
+class HERECircuitOpenError(aiohere.HereError):
+    """The request was not made because the circuit breaker is open."""
+
+
+def backoff_delay(base: timedelta, attempt: int, maximum: timedelta) -> timedelta:
+    """Return the delay before retrying after the given failed attempt.
+
+    The delay doubles with every attempt up to maximum. It is spread over its
+    upper half so that clients failing together do not retry together.
+    """
+    delay: timedelta = min(base * 2 ** (attempt - 1), maximum)
+    return delay * random.uniform(0.5, 1)
+
+
+class HERECircuitBreaker:
+    """Circuit breaker for the requests made with one API key.
+
+    An unauthorized key opens the breaker right away, transient errors after
+    FAILURE_THRESHOLD consecutive failures. While open, requests are rejected
+    until the backoff delay passed. Then a single probe request is let
+    through: its success closes the breaker, its failure opens it again for
+    twice as long. Invalid requests only concern the requested location and
+    prove that HERE is reachable.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at: datetime | None = None
+        self.last_error: str | None = None
+        self._openings = 0
+        self._probing = False
+
+    @callback
+    def async_before_request(self) -> None:
+        """Raise HERECircuitOpenError unless a request may be made now."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN:
+            assert self.retry_at is not None
+            if dt_util.utcnow() < self.retry_at:
+                raise HERECircuitOpenError(
+                    f"Requests to HERE are paused until {self.retry_at.isoformat()}"
+                )
+            self.state = STATE_HALF_OPEN
+        if self._probing:
+            raise HERECircuitOpenError("Waiting for the probe request to HERE")
+        self._probing = True
+
+    @callback
+    def async_record_success(self) -> None:
+        """Close the breaker after HERE answered a request."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Requests to HERE are working again")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = None
+        self._openings = 0
+        self._probing = False
+
+    @callback
+    def async_record_failure(self, error: BaseException) -> None:
+        """Count the failure of a request according to its cause."""
+        if isinstance(error, aiohere.HereInvalidRequestError):
+            self.async_record_success()
+            return
+        self._probing = False
+        if isinstance(error, aiohere.HereUnauthorizedError):
+            self._open(error, UNAUTHORIZED_RETRY, MAX_UNAUTHORIZED_RETRY)
+        elif isinstance(
+            error, HERERateLimitExceeded | HERECircuitOpenError
+        ) or not isinstance(error, aiohere.HereError | asyncio.TimeoutError):
+            # The request did not reach HERE
+            return
+        else:
+            self.failures += 1
+            self.last_error = repr(error)
+            if self.state == STATE_HALF_OPEN or self.failures >= FAILURE_THRESHOLD:
+                self._open(error, TRANSIENT_RETRY, MAX_TRANSIENT_RETRY)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+            "last_error": self.last_error,
+        }
+
+    def _open(self, error: BaseException, base: timedelta, maximum: timedelta) -> None:
+        """Reject requests until the next backoff delay passed."""
+        self._openings += 1
+        self.state = STATE_OPEN
+        self.last_error = repr(error)
+        retry_at = dt_util.utcnow() + backoff_delay(base, self._openings, maximum)
+        self.retry_at = retry_at
+        _LOGGER.warning(
+            "Pausing requests to HERE until %s: %s", retry_at.isoformat(), error
+        )
+
+
+@callback
+def async_get_circuit_breaker(hass: HomeAssistant, api_key: str) -> HERECircuitBreaker:
+    """Return the circuit breaker shared by everything using api_key."""
+    breakers: dict[str, HERECircuitBreaker] = hass.data.setdefault(
+        DATA_CIRCUIT_BREAKERS, {}
+    )
+    return breakers.setdefault(get_api_key_id(api_key), HERECircuitBreaker())
@@ -1,6 +1,9 @@
 """Config flow for here_weather integration."""
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import Any
+
 import aiohere
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
@@ -8,15 +11,37 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import CONF_LANGUAGE, DEFAULT_LANGUAGE, DEFAULT_MODE, DOMAIN, LANGUAGES
+from . import async_remove_location_stores
+from .const import (
+    CONF_LANGUAGE,
+    CONF_LOCATIONS,
+    CONF_MAX_STALENESS,
+    CONF_MODES,
+    CONF_NOWCAST,
+    CONF_NOWCAST_INTERPOLATE,
+    CONF_OFFSETS,
+    CONF_SCAN_INTERVALS,
+    DEFAULT_LANGUAGE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MODE,
+    DEFAULT_SCAN_INTERVALS,
+    DOMAIN,
+    LANGUAGES,
+    MAX_OFFSETS,
+)
+from .rate_limit import HERERateLimitExceeded, async_get_rate_limiter
+from .utils import get_locations, get_offsets, get_unique_id
 
 
 async def async_validate_user_input(hass: HomeAssistant, user_input: dict) -> None:
     """Validate the user_input containing coordinates."""
     session = async_get_clientsession(hass)
     here_client = aiohere.AioHere(user_input[CONF_API_KEY], session=session)
+    rate_limiter = await async_get_rate_limiter(hass, user_input[CONF_API_KEY])
+    await rate_limiter.async_acquire()
     await here_client.weather_for_coordinates(
         user_input[CONF_LATITUDE],
         user_input[CONF_LONGITUDE],
@@ -35,12 +60,16 @@ class HereWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type:
         if user_input is not None:
             await self.async_set_unique_id(_unique_id(user_input))
             self._abort_if_unique_id_configured()
+            if get_unique_id(user_input) in _configured_location_ids(self.hass):
+                return self.async_abort(reason="already_configured")
             try:
                 await async_validate_user_input(self.hass, user_input)
             except aiohere.HereInvalidRequestError:
                 errors["base"] = "invalid_request"
             except aiohere.HereUnauthorizedError:
                 errors["base"] = "unauthorized"
+            except HERERateLimitExceeded:
+                errors["base"] = "rate_limited"
             else:
                 return self.async_create_entry(
                     title=user_input[CONF_NAME], data=user_input
@@ -94,8 +123,17 @@ class HereWeatherConfigFlowOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the here_weather options."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["settings", "offsets", "add_location", "remove_location"],
+        )
+
+    async def async_step_settings(self, user_input=None) -> FlowResult:
+        """Manage the language and the update intervals."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
 
         options = {
             vol.Optional(
@@ -103,9 +141,167 @@ class HereWeatherConfigFlowOptionsFlowHandler(config_entries.OptionsFlow):
                 default=self.config_entry.options.get(CONF_LANGUAGE, DEFAULT_LANGUAGE),
             ): vol.In(LANGUAGES.keys()),
         }
+        for mode, conf_scan_interval in CONF_SCAN_INTERVALS.items():
+            options[
+                vol.Optional(
+                    conf_scan_interval,
+                    default=self.config_entry.options.get(
+                        conf_scan_interval, DEFAULT_SCAN_INTERVALS[mode]
+                    ),
+                )
+            ] = vol.All(vol.Coerce(int), vol.Range(min=5))
+        options[
+            vol.Optional(
+                CONF_MAX_STALENESS,
+                default=self.config_entry.options.get(
+                    CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+                ),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0))
+        for conf_nowcast in (CONF_NOWCAST, CONF_NOWCAST_INTERPOLATE):
+            options[
+                vol.Optional(
+                    conf_nowcast,
+                    default=self.config_entry.options.get(conf_nowcast, False),
+                )
+            ] = bool
+
+        return self.async_show_form(step_id="settings", data_schema=vol.Schema(options))
+
+    async def async_step_offsets(self, user_input=None) -> FlowResult:
+        """Manage the offsets of the records which get sensors."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self.config_entry.options,
+                    **{
+                        conf_offsets: sorted(int(offset) for offset in offsets)
+                        for conf_offsets, offsets in user_input.items()
+                    },
+                },
+            )
+
+        options = {
+            vol.Optional(
+                CONF_OFFSETS[mode],
+                default=[
+                    str(offset) for offset in get_offsets(self.config_entry, mode)
+                ],
+            ): cv.multi_select(
+                {str(offset): f"+{offset}" for offset in range(max_offset + 1)}
+            )
+            for mode, max_offset in MAX_OFFSETS.items()
+            if max_offset > 0
+        }
+        return self.async_show_form(step_id="offsets", data_schema=vol.Schema(options))
+
+    async def async_step_add_location(self, user_input=None) -> FlowResult:
+        """Add another location to the entry."""
+        errors = {}
+        if user_input is not None:
+            if get_unique_id(user_input) in _configured_location_ids(self.hass):
+                errors["base"] = "already_configured"
+            else:
+                try:
+                    await async_validate_user_input(
+                        self.hass,
+                        {
+                            **user_input,
+                            CONF_API_KEY: self.config_entry.data[CONF_API_KEY],
+                        },
+                    )
+                except aiohere.HereInvalidRequestError:
+                    errors["base"] = "invalid_request"
+                except aiohere.HereUnauthorizedError:
+                    errors["base"] = "unauthorized"
+                except HERERateLimitExceeded:
+                    errors["base"] = "rate_limited"
+                else:
+                    return self.async_create_entry(
+                        title="",
+                        data={
+                            **self.config_entry.options,
+                            CONF_LOCATIONS: [
+                                *self.config_entry.options.get(CONF_LOCATIONS, []),
+                                user_input,
+                            ],
+                        },
+                    )
+        return self.async_show_form(
+            step_id="add_location",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): str,
+                    vol.Required(
+                        CONF_LATITUDE, default=self.hass.config.latitude
+                    ): cv.latitude,
+                    vol.Required(
+                        CONF_LONGITUDE, default=self.hass.config.longitude
+                    ): cv.longitude,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_remove_location(self, user_input=None) -> FlowResult:
+        """Remove one of the added locations from the entry."""
+        locations = {
+            get_unique_id(location): location
+            for location in self.config_entry.options.get(CONF_LOCATIONS, [])
+        }
+        if not locations:
+            return self.async_abort(reason="no_locations")
+        if user_input is not None:
+            removed = locations.pop(user_input[CONF_LOCATIONS])
+            await async_remove_location(self.hass, self.config_entry, removed)
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self.config_entry.options,
+                    CONF_LOCATIONS: list(locations.values()),
+                },
+            )
+        return self.async_show_form(
+            step_id="remove_location",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_LOCATIONS): vol.In(
+                        {
+                            location_id: location[CONF_NAME]
+                            for location_id, location in locations.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+
+async def async_remove_location(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, location: dict
+) -> None:
+    """Remove the devices and the cached payloads of a location of an entry."""
+    device_registry = dr.async_get(hass)
+    for mode in CONF_MODES:
+        if device := device_registry.async_get_device(
+            {(DOMAIN, get_unique_id(location, mode))}
+        ):
+            device_registry.async_remove_device(device.id)
+    await async_remove_location_stores(hass, entry.entry_id, location)
+
+
+def _configured_location_ids(hass: HomeAssistant) -> set[str]:
+    """Return the unique_ids of the locations of all entries.
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
+    The unique_ids of the entities are built from the coordinates, so a
+    location can only belong to a single entry.
+    """
+    return {
+        get_unique_id(location)
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        for location in get_locations(entry)
+    }
 
 
-def _unique_id(user_input: dict) -> str:
-    return f"{user_input[CONF_LATITUDE]}_{user_input[CONF_LONGITUDE]}"
+def _unique_id(location: Mapping[str, Any]) -> str:
+    return f"{location[CONF_LATITUDE]}_{location[CONF_LONGITUDE]}"
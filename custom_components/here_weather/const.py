@@ -1,6 +1,9 @@
 """Constants for the HERE Destination Weather service."""
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from homeassistant.const import (
     DEGREE,
     UnitOfLength,
@@ -26,7 +29,28 @@ If you have any issues with this you need to open an issue here:
 -------------------------------------------------------------------
 """
 
-DEFAULT_SCAN_INTERVAL = 1800  # 30 minutes
+CONF_MAX_CONCURRENT_SETUPS = "max_concurrent_setups"
+DEFAULT_MAX_CONCURRENT_SETUPS = 10
+DATA_SETUP_SEMAPHORE = f"{DOMAIN}_setup_semaphore"
+CONF_MAX_CONCURRENT_FETCHES = "max_concurrent_fetches"
+DEFAULT_MAX_CONCURRENT_FETCHES = 10
+CONF_LOCATION_PRECISION = "location_precision"
+DATA_FETCHER = f"{DOMAIN}_fetcher"
+DATA_SESSION = f"{DOMAIN}_session"
+
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+DEFAULT_REQUESTS_PER_MINUTE = 60
+CONF_MONTHLY_QUOTA = "monthly_quota"
+DATA_RATE_LIMIT_CONFIG = f"{DOMAIN}_rate_limit_config"
+DATA_RATE_LIMITERS = f"{DOMAIN}_rate_limiters"
+# Requests waiting longer than this for the rate limiter are rejected (seconds)
+MAX_THROTTLE_DELAY = 30
+RATE_LIMIT_COUNTERS = ["requests", "throttled", "rejected"]
+QUOTA_REMAINING = "quota_remaining"
+
+DATA_CIRCUIT_BREAKERS = f"{DOMAIN}_circuit_breakers"
+
+CONF_LOCATIONS = "locations"
 
 CONF_LANGUAGE = "language"
 DEFAULT_LANGUAGE = "English - United States"
@@ -45,6 +69,50 @@ CONF_MODES = [
 ]
 DEFAULT_MODE = MODE_DAILY_SIMPLE
 
+# Update intervals in minutes, aligned to local midnight plus a per-entry phase
+CONF_SCAN_INTERVALS = {mode: f"{mode.lower()}_scan_interval" for mode in CONF_MODES}
+DEFAULT_SCAN_INTERVALS = {
+    MODE_ASTRONOMY: 1440,
+    MODE_HOURLY: 60,
+    MODE_DAILY: 180,
+    MODE_DAILY_SIMPLE: 180,
+    MODE_OBSERVATION: 15,
+}
+
+# Minutes the last good data is still shown after a refresh failed
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MAX_STALENESS = 60
+# Seconds since stale data was fetched
+ATTR_DATA_AGE = "data_age"
+
+# Roll the hourly forecast forward to the current hour between requests and
+# optionally interpolate the current values every few minutes
+CONF_NOWCAST = "nowcast"
+CONF_NOWCAST_INTERPOLATE = "nowcast_interpolate"
+NOWCAST_INTERPOLATION_MINUTES = 10
+
+# Offsets of the records sensors can be created for, e.g. hours or days ahead
+CONF_OFFSETS = {mode: f"{mode.lower()}_offsets" for mode in CONF_MODES}
+DEFAULT_OFFSETS = [0]
+MAX_OFFSETS = {
+    MODE_ASTRONOMY: 7,
+    MODE_HOURLY: 47,
+    MODE_DAILY: 27,
+    MODE_DAILY_SIMPLE: 6,
+    MODE_OBSERVATION: 0,
+}
+
+PAYLOAD_KEYS = {
+    MODE_ASTRONOMY: "astronomyForecasts",
+    MODE_HOURLY: "hourlyForecasts",
+    MODE_DAILY: "extendedDailyForecasts",
+    MODE_DAILY_SIMPLE: "dailyForecasts",
+    MODE_OBSERVATION: "observations",
+}
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
 ASTRONOMY_ATTRIBUTES: dict[str, dict[str, str | None]] = {
     "sunRise": {
         "name": "Sunrise",
@@ -521,6 +589,16 @@ CONDITION_CLASSES: dict[str, list[str]] = {
     ],
 }
 
+# Reverse index of CONDITION_CLASSES. If an icon is listed for more than one
+# condition, the first condition wins.
+ICON_CONDITIONS: Mapping[str, str] = MappingProxyType(
+    {
+        icon: condition
+        for condition, icons in reversed(CONDITION_CLASSES.items())
+        for icon in icons
+    }
+)
+
 LANGUAGES: dict[str, str] = {
     "Afar - Djibouti": "aa-DJ",
     "Afar - Eritrea": "aa-ER",
@@ -0,0 +1,47 @@
+"""Diagnostics support for here_weather."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant
+
+from . import HEREWeatherDataUpdateCoordinator
+from .const import DOMAIN
+
+# The unique_id is built from the coordinates, the names often name the place
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    CONF_UNIQUE_ID,
+    "title",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HEREWeatherDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "circuit_breaker": coordinator.circuit_breaker.as_dict(),
+        "rate_limiter": {
+            "counters": coordinator.rate_limiter.counters,
+            "quota_remaining": coordinator.rate_limiter.quota_remaining,
+        },
+        "modes": {
+            mode: statistics.as_dict()
+            for mode, statistics in coordinator.statistics.items()
+        },
+    }
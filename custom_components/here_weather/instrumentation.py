@@ -0,0 +1,95 @@
+"""In-memory instrumentation of the requests made to HERE."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+# Number of the latest samples the percentiles are computed from
+SAMPLE_WINDOW = 100
+PERCENTILES = (50, 90, 99)
+
+
+class RollingStatistics:
+    """Percentiles over the latest samples of a measurement."""
+
+    def __init__(self, window: int = SAMPLE_WINDOW) -> None:
+        """Initialize the statistics."""
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        """Add a sample, dropping the oldest one once the window is full."""
+        self.count += 1
+        self._samples.append(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the number of samples, the latest one and the percentiles."""
+        if not self._samples:
+            return {"count": 0}
+        samples = sorted(self._samples)
+        return {
+            "count": self.count,
+            "last": self._samples[-1],
+            # Nearest-rank percentiles
+            **{
+                f"p{percentile}": samples[
+                    max(-(-percentile * len(samples) // 100) - 1, 0)
+                ]
+                for percentile in PERCENTILES
+            },
+            "max": samples[-1],
+        }
+
+
+class HEREWeatherModeStatistics:
+    """Timings and outcomes of the requests for one mode of an entry."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.latency = RollingStatistics()
+        self.parse_time = RollingStatistics()
+        self.records = RollingStatistics()
+        self.response_size = RollingStatistics()
+        self.last_success: datetime | None = None
+        self.last_failure: datetime | None = None
+        self.last_error: str | None = None
+
+    def record_success(
+        self,
+        fetched: datetime,
+        latency: float,
+        parse_time: float,
+        records: int,
+        response_size: int | None,
+    ) -> None:
+        """Record the measurements of a successful request."""
+        self.latency.add(latency)
+        self.parse_time.add(parse_time)
+        self.records.add(records)
+        # Unknown if the response was not read through the session for HERE
+        if response_size is not None:
+            self.response_size.add(response_size)
+        self.last_success = fetched
+
+    def record_failure(self, now: datetime, error: BaseException) -> None:
+        """Record a failed request."""
+        self.last_failure = now
+        self.last_error = repr(error)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "latency": self.latency.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+            "records": self.records.as_dict(),
+            "response_size": self.response_size.as_dict(),
+            "last_success": _isoformat(self.last_success),
+            "last_failure": _isoformat(self.last_failure),
+            "last_error": self.last_error,
+        }
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    """Return value in ISO 8601 format if it is set."""
+    return value.isoformat() if value is not None else None
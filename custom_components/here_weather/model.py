@@ -0,0 +1,270 @@
+"""Parsed data of the HERE Destination Weather service."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .const import ICON_CONDITIONS, SENSOR_TYPES
+from .utils import convert_asterisk_to_none, convert_number
+
+
+@dataclass(slots=True)
+class HEREWeatherRecord:
+    """A single element of a HERE payload, parsed for one mode.
+
+    Placeholders are normalized and numbers are converted when the payload
+    is parsed. The values of the weather entities are derived from the
+    attributes when they are read.
+    """
+
+    attributes: dict[str, str | float | datetime | None]
+
+    @classmethod
+    def from_element(cls, element: Mapping[str, Any], mode: str) -> HEREWeatherRecord:
+        """Create a record from an element of the HERE payload for mode."""
+        return cls(
+            {
+                name: (
+                    convert_number(value)
+                    if details["unit_of_measurement"] is not None
+                    else value
+                )
+                if (value := convert_asterisk_to_none(element.get(name))) is not None
+                else None
+                for name, details in SENSOR_TYPES[mode].items()
+            }
+        )
+
+    @property
+    def time(self) -> datetime | None:
+        """Return the time the record is valid from."""
+        time = self.attributes.get("time")
+        return time if isinstance(time, datetime) else None
+
+    @property
+    def condition(self) -> str | None:
+        """Return the condition of the icon of the record."""
+        return ICON_CONDITIONS.get(self.attributes.get("iconName"))  # type: ignore[arg-type]
+
+    @property
+    def temperature(self) -> float | None:
+        """Return the temperature, the high temperature for daily simple forecasts."""
+        if "temperature" in self.attributes:
+            return _to_float(self.attributes["temperature"])
+        return _to_float(self.attributes.get("highTemperature"))
+
+    @property
+    def high_temperature(self) -> float | None:
+        """Return the high temperature, falling back to the temperature."""
+        if (
+            high_temperature := _to_float(self.attributes.get("highTemperature"))
+        ) is None:
+            return self.temperature
+        return high_temperature
+
+    @property
+    def low_temperature(self) -> float | None:
+        """Return the low temperature, falling back to the temperature."""
+        if (
+            low_temperature := _to_float(self.attributes.get("lowTemperature"))
+        ) is None:
+            return self.temperature
+        return low_temperature
+
+    @property
+    def pressure(self) -> float | None:
+        """Return the barometric pressure."""
+        return _to_float(self.attributes.get("barometerPressure"))
+
+    @property
+    def wind_speed(self) -> float | None:
+        """Return the wind speed."""
+        return _to_float(self.attributes.get("windSpeed"))
+
+    @property
+    def wind_bearing(self) -> int | None:
+        """Return the wind direction."""
+        if (wind_bearing := _to_float(self.attributes.get("windDirection"))) is None:
+            return None
+        return round(wind_bearing)
+
+    @property
+    def visibility(self) -> float | None:
+        """Return the visibility."""
+        return _to_float(self.attributes.get("visibility"))
+
+    @property
+    def precipitation_probability(self) -> int | None:
+        """Return the probability of precipitation."""
+        probability = _to_float(self.attributes.get("precipitationProbability"))
+        if probability is None:
+            return None
+        return round(probability)
+
+    @property
+    def precipitation(self) -> float | None:
+        """Return the sum of the rain and the snow fall."""
+        rain_fall = _to_float(self.attributes.get("rainFall"))
+        snow_fall = _to_float(self.attributes.get("snowFall"))
+        if rain_fall is None or snow_fall is None:
+            return None
+        return rain_fall + snow_fall
+
+
+def diff_records(
+    old: Sequence[HEREWeatherRecord] | None, new: Sequence[HEREWeatherRecord]
+) -> set[tuple[int, str]]:
+    """Return the (offset, name) of the values which differ between old and new.
+
+    Names are the keys of the attributes of the records. Records present on
+    one side only differ in all their values.
+    """
+    if old is new:
+        return set()
+    old = old or []
+    changes: set[tuple[int, str]] = set()
+    for offset in range(max(len(old), len(new))):
+        if offset >= len(old) or offset >= len(new):
+            record = new[offset] if offset < len(new) else old[offset]
+            changes.update((offset, name) for name in record.attributes)
+        elif (old_attributes := old[offset].attributes) != (
+            new_attributes := new[offset].attributes
+        ):
+            changes.update(
+                (offset, name)
+                for name, value in new_attributes.items()
+                if old_attributes.get(name) != value
+            )
+    return changes
+
+
+def value_table(
+    records: Sequence[HEREWeatherRecord], keys: Iterable[tuple[str, int]]
+) -> dict[tuple[str, int], str | float | datetime | None]:
+    """Return the attributes of the records for the given (attribute, offset)."""
+    return {
+        (name, offset): records[offset].attributes[name]
+        for name, offset in keys
+        if offset < len(records) and name in records[offset].attributes
+    }
+
+
+# Attributes interpolated between neighbouring records, the others are taken
+# from the nearer one. Bearings are circular and not interpolated.
+INTERPOLATED_ATTRIBUTES = [
+    "temperature",
+    "highTemperature",
+    "lowTemperature",
+    "barometerPressure",
+    "windSpeed",
+    "visibility",
+    "precipitationProbability",
+    "rainFall",
+    "snowFall",
+    "humidity",
+    "dewPoint",
+]
+
+
+class HEREWeatherTimeIndex:
+    """The records of a mode sorted by time for lookups by bisection.
+
+    A record is valid from its time until the time of the next record.
+    """
+
+    def __init__(self, records: Sequence[HEREWeatherRecord]) -> None:
+        """Index the records which have a time."""
+        self._records = sorted(
+            (record for record in records if record.time is not None),
+            key=lambda record: record.time,  # type: ignore[arg-type, return-value]
+        )
+        self._times: list[datetime] = [
+            record.time for record in self._records  # type: ignore[misc]
+        ]
+
+    def at(self, when: datetime, interpolate: bool = False) -> HEREWeatherRecord | None:
+        """Return the record valid at when or None if when is before all records.
+
+        With interpolate, a record between the valid and the next record is
+        returned instead.
+        """
+        index = bisect_right(self._times, when) - 1
+        if index < 0:
+            return None
+        record = self._records[index]
+        if not interpolate or record.time == when or index + 1 == len(self._records):
+            return record
+        return interpolate_records(record, self._records[index + 1], when)
+
+    def roll_forward(
+        self, now: datetime, interpolate: bool = False
+    ) -> list[HEREWeatherRecord]:
+        """Return the records from the one valid at now on.
+
+        With interpolate, the first record is replaced by one interpolated
+        at now.
+        """
+        index = max(bisect_right(self._times, now) - 1, 0)
+        records = self._records[index:]
+        if interpolate and len(records) > 1 and self._times[index] < now:
+            records[0] = interpolate_records(records[0], records[1], now)
+        return records
+
+    def between(self, start: datetime, end: datetime) -> list[HEREWeatherRecord]:
+        """Return the records from start until end, both inclusive."""
+        return self._records[
+            bisect_left(self._times, start) : bisect_right(self._times, end)
+        ]
+
+
+def interpolate_records(
+    before: HEREWeatherRecord, after: HEREWeatherRecord, when: datetime
+) -> HEREWeatherRecord:
+    """Return a record at when, linearly interpolated between two records."""
+    assert before.time is not None and after.time is not None
+    weight = (when - before.time) / (after.time - before.time)
+    nearer = before if weight < 0.5 else after
+    attributes = dict(nearer.attributes)
+    for name in INTERPOLATED_ATTRIBUTES:
+        if name in attributes:
+            attributes[name] = _interpolate(
+                before.attributes.get(name),
+                after.attributes.get(name),
+                weight,
+                attributes[name],
+            )
+    attributes["time"] = when
+    return HEREWeatherRecord(attributes)
+
+
+def _interpolate(first: Any, second: Any, weight: float, default: Any) -> Any:
+    """Return the value at weight between two numbers, else default."""
+    if not isinstance(first, (int, float)) or not isinstance(second, (int, float)):
+        return default
+    value = first + (second - first) * weight
+    return round(value) if isinstance(first, int) else round(value, 2)
+
+
+def _to_float(value: Any) -> float | None:
+    """Return a converted number as float or None for other values."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+@dataclass(slots=True)
+class HEREWeatherFetchResult:
+    """The parsed records of one mode fetched from HERE.
+
+    The latency of the request and the time parsing the records took are
+    given in seconds, the size of the response the mode arrived in in bytes.
+    """
+
+    fetched: datetime
+    records: list[HEREWeatherRecord]
+    latency: float = 0.0
+    parse_time: float = 0.0
+    response_size: int | None = None
@@ -0,0 +1,145 @@
+"""Rate limiting and quota accounting of the requests made to HERE."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import aiohere
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    CONF_MONTHLY_QUOTA,
+    CONF_REQUESTS_PER_MINUTE,
+    DATA_RATE_LIMIT_CONFIG,
+    DATA_RATE_LIMITERS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    MAX_THROTTLE_DELAY,
+    RATE_LIMIT_COUNTERS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .utils import get_api_key_id
+
+
+class HERERateLimitExceeded(aiohere.HereError):
+    """The request was rejected by the rate limiter before reaching HERE."""
+
+
+class HERERateLimiter:
+    """Token bucket and monthly request counters for one API key.
+
+    The bucket holds the requests of one minute. A request finding it empty
+    waits for its token, unless that takes longer than MAX_THROTTLE_DELAY or
+    the monthly quota is used up, in which case it is rejected.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        monthly_quota: int | None = None,
+    ) -> None:
+        """Initialize the rate limiter."""
+        self.monthly_quota = monthly_quota
+        self.counters = dict.fromkeys(RATE_LIMIT_COUNTERS, 0)
+        self._store = store
+        self._month = _current_month()
+        self._capacity = float(requests_per_minute)
+        self._rate = requests_per_minute / 60
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> None:
+        """Restore the counters of the current month."""
+        stored = await self._store.async_load()
+        if stored is not None and stored["month"] == self._month:
+            self.counters.update(stored["counters"])
+
+    @property
+    def quota_remaining(self) -> int | None:
+        """Return the number of requests left this month."""
+        if self.monthly_quota is None:
+            return None
+        return max(self.monthly_quota - self.counters["requests"], 0)
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be made and count it."""
+        self._roll_over_month()
+        if self.quota_remaining == 0:
+            self._count("rejected")
+            raise HERERateLimitExceeded("The monthly quota is used up")
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        # Tokens are reserved right away so concurrent requests queue up
+        if (delay := (1 - self._tokens) / self._rate) > MAX_THROTTLE_DELAY:
+            self._count("rejected")
+            raise HERERateLimitExceeded("Too many requests")
+        self._tokens -= 1
+        if delay > 0:
+            self._count("throttled")
+            await asyncio.sleep(delay)
+        self._count("requests")
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for changes of the counters."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def _roll_over_month(self) -> None:
+        """Reset the counters when a new month started."""
+        if (month := _current_month()) != self._month:
+            self._month = month
+            self.counters = dict.fromkeys(RATE_LIMIT_COUNTERS, 0)
+
+    def _count(self, counter: str) -> None:
+        """Increase a counter, save it and notify the listeners."""
+        self.counters[counter] += 1
+        self._store.async_delay_save(
+            lambda: {"month": self._month, "counters": self.counters},
+            STORAGE_SAVE_DELAY,
+        )
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+async def async_get_rate_limiter(hass: HomeAssistant, api_key: str) -> HERERateLimiter:
+    """Return the rate limiter shared by everything using api_key."""
+    # The API key itself is neither used as a storage key nor stored
+    key_id = get_api_key_id(api_key)
+    limiters: dict[str, asyncio.Task[HERERateLimiter]] = hass.data.setdefault(
+        DATA_RATE_LIMITERS, {}
+    )
+    if key_id not in limiters:
+        limiters[key_id] = hass.async_create_task(
+            _async_create_rate_limiter(hass, key_id)
+        )
+    return await limiters[key_id]
+
+
+async def _async_create_rate_limiter(
+    hass: HomeAssistant, key_id: str
+) -> HERERateLimiter:
+    """Create a rate limiter with the configured limits and load its counters."""
+    config = hass.data.get(DATA_RATE_LIMIT_CONFIG, {})
+    limiter = HERERateLimiter(
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.rate_limit.{key_id}"),
+        config.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+        config.get(CONF_MONTHLY_QUOTA),
+    )
+    await limiter.async_load()
+    return limiter
+
+
+def _current_month() -> str:
+    """Return the current month in UTC, e.g. 2023-01."""
+    month: str = dt_util.utcnow().strftime("%Y-%m")
+    return month
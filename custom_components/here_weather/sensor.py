@@ -1,44 +1,56 @@
 """Sensor platform for the HERE Destination Weather service."""
 # pyright: reportGeneralTypeIssues=false
 from __future__ import annotations
+from collections.abc import Mapping
 from datetime import datetime
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    CONF_LATITUDE,
-    CONF_LONGITUDE,
-    CONF_NAME,
-)
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SENSOR_TYPES
-from .utils import get_attribute_from_here_data
+from . import HEREWeatherDataUpdateCoordinator
+from .const import (
+    ATTR_DATA_AGE,
+    DOMAIN,
+    QUOTA_REMAINING,
+    RATE_LIMIT_COUNTERS,
+    SENSOR_TYPES,
+)
+from .rate_limit import HERERateLimiter
+from .utils import get_locations, get_offsets, get_unique_id
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Add here_weather entities from a ConfigEntry."""
-    here_weather_coordinators = hass.data[DOMAIN][entry.entry_id]
+    here_weather_coordinator = hass.data[DOMAIN][entry.entry_id]
 
     sensors_to_add = []
-    for sensor_type, weather_attributes in SENSOR_TYPES.items():
-        for weather_attribute in weather_attributes:
-            sensors_to_add.append(
-                HEREDestinationWeatherSensor(
-                    entry,
-                    here_weather_coordinators[sensor_type],
-                    sensor_type,
-                    weather_attribute,
-                )
-            )
+    for location in get_locations(entry):
+        for sensor_type, weather_attributes in SENSOR_TYPES.items():
+            for offset in get_offsets(entry, sensor_type):
+                for weather_attribute in weather_attributes:
+                    sensors_to_add.append(
+                        HEREDestinationWeatherSensor(
+                            location,
+                            here_weather_coordinator,
+                            sensor_type,
+                            weather_attribute,
+                            offset,
+                        )
+                    )
+    rate_limiter = here_weather_coordinator.rate_limiter
+    counters = list(RATE_LIMIT_COUNTERS)
+    if rate_limiter.monthly_quota is not None:
+        counters.append(QUOTA_REMAINING)
+    for counter in counters:
+        sensors_to_add.append(HEREWeatherRateLimitSensor(entry, rate_limiter, counter))
     async_add_entities(sensors_to_add)
 
 
@@ -47,44 +59,31 @@ class HEREDestinationWeatherSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(
         self,
-        entry: ConfigEntry,
-        coordinator: DataUpdateCoordinator,
+        location: Mapping[str, Any],
+        coordinator: HEREWeatherDataUpdateCoordinator,
         sensor_type: str,
         weather_attribute: str,
-        sensor_number: int = 0,  # Additional supported offsets will be added in a separate PR
+        sensor_number: int = 0,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        base_name = entry.data[CONF_NAME]
+        self._data_key = (get_unique_id(location), sensor_type)
+        super().__init__(coordinator, context=self._data_key)
+        base_name = location[CONF_NAME]
         name_suffix = SENSOR_TYPES[sensor_type][weather_attribute]["name"]
+        self._sensor_type = sensor_type
         self._sensor_number = sensor_number
         self._weather_attribute = weather_attribute
+        self._value_key = (weather_attribute, sensor_number)
+        self._written_available: bool | None = None
+        self._written_stale = False
         self._attr_device_info = DeviceInfo(
-            identifiers={
-                (
-                    DOMAIN,
-                    "".join(
-                        (
-                            f"{entry.data[CONF_LATITUDE]}"
-                            f"_{entry.data[CONF_LONGITUDE]}"
-                            f"_{sensor_type}"
-                        )
-                        .lower()
-                        .split()
-                    ),
-                )
-            },
+            identifiers={(DOMAIN, get_unique_id(location, sensor_type))},
             name=f"{base_name} {sensor_type}",
             manufacturer="here.com",
             entry_type=DeviceEntryType.SERVICE,
         )
-        self._attr_unique_id = "".join(
-            (
-                f"{entry.data[CONF_LATITUDE]}_{entry.data[CONF_LONGITUDE]}"
-                f"_{sensor_type}_{name_suffix}_{self._sensor_number}"
-            )
-            .lower()
-            .split()
+        self._attr_unique_id = get_unique_id(
+            location, sensor_type, name_suffix, self._sensor_number
         )
         self._attr_name = (
             f"{base_name} {sensor_type} " f"{name_suffix} {self._sensor_number}"
@@ -99,11 +98,94 @@ class HEREDestinationWeatherSensor(CoordinatorEntity, SensorEntity):
         ) is not None:
             self._attr_device_class = device_class
 
+    async def async_added_to_hass(self) -> None:
+        """Remember the availability written when the sensor is added."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the value or the availability of the sensor changed.
+
+        While the data is stale, the state is written on every update to
+        keep its age current.
+        """
+        available = self.available
+        stale = (
+            available and self.coordinator.async_data_age(self._data_key) is not None
+        )
+        if (
+            available == self._written_available
+            and not (stale or self._written_stale)
+            and not self.coordinator.async_has_changed(
+                self._data_key, (self._sensor_number, self._weather_attribute)
+            )
+        ):
+            return
+        self._written_available = available
+        self._written_stale = stale
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return if the data for the mode of this sensor is available."""
+        return (
+            super().available
+            and self._data_key in self.coordinator.data
+            and self.coordinator.async_is_servable(self._data_key)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the age of the data in seconds if it is stale."""
+        if (data_age := self.coordinator.async_data_age(self._data_key)) is None:
+            return None
+        return {ATTR_DATA_AGE: round(data_age.total_seconds())}
+
     @property
     def native_value(self) -> str | float | datetime | None:
         """Return the state of the sensor."""
-        return get_attribute_from_here_data(
-            self.coordinator.data,
-            self._weather_attribute,
-            self._sensor_number,
+        values: dict[
+            tuple[str, int], str | float | datetime | None
+        ] = self.coordinator.values[self._data_key]
+        return values.get(self._value_key)
+
+
+class HEREWeatherRateLimitSensor(SensorEntity):
+    """Diagnostic sensor for a counter of the rate limiter of the API key."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+
+    def __init__(
+        self, entry: ConfigEntry, rate_limiter: HERERateLimiter, counter: str
+    ) -> None:
+        """Initialize the sensor."""
+        self._rate_limiter = rate_limiter
+        self._counter = counter
+        base_name = entry.data[CONF_NAME]
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, get_unique_id(entry.data, "api"))},
+            name=f"{base_name} API",
+            manufacturer="here.com",
+            entry_type=DeviceEntryType.SERVICE,
         )
+        self._attr_unique_id = get_unique_id(entry.data, "api", counter)
+        self._attr_name = f"{base_name} API {counter.replace('_', ' ')}"
+        if counter != QUOTA_REMAINING:
+            # The counters start again from zero every month
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state whenever the counters change."""
+        self.async_on_remove(
+            self._rate_limiter.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the value of the counter for the current month."""
+        if self._counter == QUOTA_REMAINING:
+            return self._rate_limiter.quota_remaining
+        return self._rate_limiter.counters[self._counter]
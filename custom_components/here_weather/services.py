@@ -0,0 +1,94 @@
+"""Services of the here_weather integration."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.components.weather import DOMAIN as WEATHER_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .weather import HEREDestinationWeather
+
+try:
+    from homeassistant.core import SupportsResponse
+except ImportError:  # Home Assistant < 2023.7 has no service responses
+    SupportsResponse = None
+
+SERVICE_GET_FORECAST_AT = "get_forecast_at"
+ATTR_DATETIME = "datetime"
+ATTR_END = "end"
+ATTR_INTERPOLATE = "interpolate"
+# Carries the response on Home Assistant versions without service responses
+EVENT_FORECAST_AT = f"{DOMAIN}_forecast_at"
+
+GET_FORECAST_AT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Required(ATTR_DATETIME): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_INTERPOLATE, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    @callback
+    def async_get_forecast_at(call: ServiceCall) -> dict[str, Any]:
+        """Return the forecast of a weather entity at a time or within a range."""
+        entity_id = call.data[ATTR_ENTITY_ID]
+        entity: HEREDestinationWeather | None = (
+            component.get_entity(entity_id)
+            if (component := hass.data.get(WEATHER_DOMAIN)) is not None
+            else None
+        )
+        if entity is None or entity.platform.platform_name != DOMAIN:
+            raise HomeAssistantError(f"{entity_id} is no HERE weather entity")
+        if not entity.available:
+            raise HomeAssistantError(f"{entity_id} is not available")
+        end = call.data.get(ATTR_END)
+        response = {
+            "forecast": entity.async_get_forecast_at(
+                _as_aware(call.data[ATTR_DATETIME]),
+                _as_aware(end) if end is not None else None,
+                call.data[ATTR_INTERPOLATE],
+            )
+        }
+        if SupportsResponse is None:
+            hass.bus.async_fire(
+                EVENT_FORECAST_AT, {ATTR_ENTITY_ID: entity_id, **response}
+            )
+        return response
+
+    if SupportsResponse is None:
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_FORECAST_AT,
+            async_get_forecast_at,
+            schema=GET_FORECAST_AT_SCHEMA,
+        )
+    else:
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_FORECAST_AT,
+            async_get_forecast_at,
+            schema=GET_FORECAST_AT_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+
+def _as_aware(value: datetime) -> datetime:
+    """Return value with the time zone of Home Assistant if it has none."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value
@@ -1,36 +1,134 @@
 """Utility functions for here_weather."""
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Mapping
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+import hashlib
+from typing import Any
 
-from homeassistant.util.dt import as_utc, parse_datetime
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.util.dt import as_local, as_utc, parse_datetime, start_of_local_day
 
+from .const import CONF_LOCATIONS, CONF_OFFSETS, DEFAULT_OFFSETS
 
-def get_attribute_from_here_data(
-    here_data: list, attribute_name: str, sensor_number: int = 0
-) -> str | datetime | float | str | None:
-    """Extract and convert data from HERE response or None if not found."""
-    try:
-        state = here_data[sensor_number][attribute_name]
-    except KeyError:
-        return None
-    return convert_asterisk_to_none(state)
+
+def get_locations(entry: ConfigEntry) -> list[Mapping[str, Any]]:
+    """Return the locations of entry, starting with the one it was created for."""
+    return [entry.data, *entry.options.get(CONF_LOCATIONS, [])]
+
+
+def get_offsets(entry: ConfigEntry, mode: str) -> list[int]:
+    """Return the offsets of the records of mode which get sensors."""
+    offsets: list[int] = entry.options.get(CONF_OFFSETS[mode], DEFAULT_OFFSETS)
+    return offsets
+
+
+def get_unique_id(location: Mapping[str, Any], *parts: object) -> str:
+    """Return the unique_id of an entity of location identified by parts."""
+    return "".join(
+        "_".join(
+            str(part)
+            for part in (location[CONF_LATITUDE], location[CONF_LONGITUDE], *parts)
+        )
+        .lower()
+        .split()
+    )
+
+
+def get_api_key_id(api_key: str) -> str:
+    """Return an identifier of api_key which does not reveal the key itself."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
 
 
-def convert_asterisk_to_none(state: str) -> str | None:
+def convert_asterisk_to_none(state: Any) -> Any:
     """Convert HERE API representation of None."""
     if state == "*":
         return None
     return state
 
 
-def combine_utc_and_local(local_time: str, utc: str) -> datetime | None:
-    """Combine local time e.g. 6:55PM and a utc timestamp."""
+def convert_number(state: Any) -> Any:
+    """Convert a numeric string of the HERE API to int or float."""
+    if not isinstance(state, str):
+        return state
+    try:
+        return int(state)
+    except ValueError:
+        pass
     try:
-        local_date_time = datetime.strptime(local_time, "%H:%M:%S")
+        return float(state)
+    except ValueError:
+        return state
+
+
+# Hourly forecasts repeat the same timestamps on every poll and for every entry
+TIMESTAMP_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=32)
+def fixed_offset(offset: timedelta) -> tzinfo:
+    """Return a shared tzinfo for a UTC offset."""
+    return timezone.utc if not offset else timezone(offset)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_here_datetime(value: str) -> datetime | None:
+    """Parse a HERE timestamp like 2022-12-25T00:00:00.000+01:00 keeping its offset."""
+    parsed: datetime | None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = parse_datetime(value)
+    if parsed is None or (offset := parsed.utcoffset()) is None:
+        return parsed
+    return parsed.replace(tzinfo=fixed_offset(offset))
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_here_datetime_as_utc(value: str) -> datetime | None:
+    """Parse a HERE timestamp and convert it to UTC."""
+    if (parsed := parse_here_datetime(value)) is None:
+        return None
+    utc_date_time: datetime = as_utc(parsed)
+    return utc_date_time
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_here_local_time(value: str) -> time | None:
+    """Parse a HERE local time like 08:24:00."""
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%H:%M:%S").time()
     except ValueError:
         return None
-    utc_date_time = parse_datetime(utc)
-    return as_utc(  # type: ignore
-        datetime.combine(utc_date_time, local_date_time.time(), utc_date_time.tzinfo)
+
+
+def combine_utc_and_local(local_time: str, utc: str) -> datetime | None:
+    """Combine local time e.g. 18:55:00 and a utc timestamp."""
+    if (local := parse_here_local_time(local_time)) is None:
+        return None
+    if (utc_date_time := parse_here_datetime(utc)) is None:
+        return None
+    combined: datetime = as_utc(
+        datetime.combine(utc_date_time, local, utc_date_time.tzinfo)
     )
+    return combined
+
+
+def get_refresh_phase(entry_id: str, period: timedelta) -> timedelta:
+    """Return a stable offset within period to spread the refreshes of entries."""
+    fraction = int(hashlib.sha256(entry_id.encode()).hexdigest()[:8], 16) / 2**32
+    return timedelta(seconds=int(fraction * period.total_seconds()))
+
+
+def next_aligned_time(
+    last: datetime, interval: timedelta, phase: timedelta = timedelta(0)
+) -> datetime:
+    """Return the first multiple of interval since local midnight + phase after last."""
+    origin = start_of_local_day(as_local(last)) + phase
+    return as_utc(origin + ((last - origin) // interval + 1) * interval)  # type: ignore
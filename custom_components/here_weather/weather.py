@@ -1,8 +1,9 @@
 """Weather platform for the HERE Destination Weather service."""
 # pyright: reportGeneralTypeIssues=false
 from __future__ import annotations
+from collections.abc import Mapping
 from datetime import datetime
-from . import HEREWeatherDataUpdateCoordinator
+from typing import Any
 
 from homeassistant.components.weather import (
     Forecast,
@@ -10,28 +11,43 @@ from homeassistant.components.weather import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    CONF_LATITUDE,
-    CONF_LONGITUDE,
     CONF_NAME,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
 )
 
+from . import HEREWeatherDataUpdateCoordinator
 from .const import (
-    CONDITION_CLASSES,
+    ATTR_DATA_AGE,
     DEFAULT_MODE,
     DOMAIN,
     MODE_ASTRONOMY,
+    MODE_DAILY,
     MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
     SENSOR_TYPES,
 )
-from .utils import (
-    get_attribute_from_here_data,
+from .model import HEREWeatherRecord
+from .utils import get_locations, get_unique_id
+
+try:
+    from homeassistant.components.weather import WeatherEntityFeature
+except ImportError:  # Home Assistant < 2023.8 only knows the forecast attribute
+    WeatherEntityFeature = None
+
+FORECAST_FEATURES = (
+    {
+        MODE_HOURLY: WeatherEntityFeature.FORECAST_HOURLY,
+        MODE_DAILY: WeatherEntityFeature.FORECAST_DAILY,
+        MODE_DAILY_SIMPLE: WeatherEntityFeature.FORECAST_DAILY,
+    }
+    if WeatherEntityFeature is not None
+    else {}
 )
 
 
@@ -39,18 +55,19 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Add here_weather entities from a ConfigEntry."""
-    here_weather_coordinators = hass.data[DOMAIN][entry.entry_id]
+    here_weather_coordinator = hass.data[DOMAIN][entry.entry_id]
 
     entities_to_add = []
-    for sensor_type in SENSOR_TYPES:
-        if sensor_type != MODE_ASTRONOMY:
-            entities_to_add.append(
-                HEREDestinationWeather(
-                    entry,
-                    here_weather_coordinators[sensor_type],
-                    sensor_type,
+    for location in get_locations(entry):
+        for sensor_type in SENSOR_TYPES:
+            if sensor_type != MODE_ASTRONOMY:
+                entities_to_add.append(
+                    HEREDestinationWeather(
+                        location,
+                        here_weather_coordinator,
+                        sensor_type,
+                    )
                 )
-            )
     async_add_entities(entities_to_add)
 
 
@@ -59,19 +76,16 @@ class HEREDestinationWeather(CoordinatorEntity, WeatherEntity):
 
     def __init__(
         self,
-        entry: ConfigEntry,
+        location: Mapping[str, Any],
         coordinator: HEREWeatherDataUpdateCoordinator,
         mode: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._name = entry.data[CONF_NAME]
+        self._data_key = (get_unique_id(location), mode)
+        super().__init__(coordinator, context=self._data_key)
+        self._name = location[CONF_NAME]
         self._mode = mode
-        unique_id = "".join(
-            (f"{entry.data[CONF_LATITUDE]}_{entry.data[CONF_LONGITUDE]}_{self._mode}")
-            .lower()
-            .split()
-        )
+        unique_id = get_unique_id(location, self._mode)
         self._attr_native_temperature_unit = UnitOfTemperature.CELSIUS
         self._attr_unique_id = unique_id
         self._attr_name = f"{self._name} {self._mode}"
@@ -82,194 +96,154 @@ class HEREDestinationWeather(CoordinatorEntity, WeatherEntity):
             manufacturer="here.com",
             entry_type=DeviceEntryType.SERVICE,
         )
+        if (feature := FORECAST_FEATURES.get(mode)) is not None:
+            self._attr_supported_features = feature
+        self._forecast: list[Forecast] = []
+        self._forecast_source: list[HEREWeatherRecord] | None = None
+        self._written_available: bool | None = None
+        self._written_stale = False
+
+    @property
+    def available(self) -> bool:
+        """Return if the data for the mode of this entity is available."""
+        return (
+            super().available
+            and bool(self.coordinator.data.get(self._data_key))
+            and self.coordinator.async_is_servable(self._data_key)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the age of the data in seconds if it is stale."""
+        if (data_age := self.coordinator.async_data_age(self._data_key)) is None:
+            return None
+        return {ATTR_DATA_AGE: round(data_age.total_seconds())}
+
+    @property
+    def _here_data(self) -> list[HEREWeatherRecord]:
+        """Return the coordinator data for the mode of this entity."""
+        here_data: list[HEREWeatherRecord] = self.coordinator.data[self._data_key]
+        return here_data
 
     @property
     def condition(self) -> str | None:
         """Return the current condition."""
-        return get_condition_from_here_data(self.coordinator.data)
+        return self._here_data[0].condition
 
     @property
     def native_temperature(self) -> float | None:
         """Return the temperature."""
-        return get_temperature_from_here_data(self.coordinator.data, self._mode)
+        return self._here_data[0].temperature
 
     @property
     def native_pressure(self) -> float | None:
         """Return the pressure."""
-        return get_pressure_from_here_data(self.coordinator.data, self._mode)
+        return self._here_data[0].pressure
 
     @property
     def native_wind_speed(self) -> float | None:
         """Return the wind speed."""
-        return get_wind_speed_from_here_data(self.coordinator.data)
+        return self._here_data[0].wind_speed
 
     @property
     def wind_bearing(self) -> float | str | None:
         """Return the wind bearing."""
-        return get_wind_bearing_from_here_data(self.coordinator.data)
+        return self._here_data[0].wind_bearing
 
     @property
     def native_visibility(self) -> float | None:
         """Return the visibility."""
-        if "visibility" in SENSOR_TYPES[self._mode]:
-            if (
-                visibility := get_attribute_from_here_data(
-                    self.coordinator.data, "visibility"
-                )
-            ) is not None:
-                return float(str(visibility))
-        return None
+        return self._here_data[0].visibility
 
     @property
     def forecast(self) -> list[Forecast] | None:
-        """Return the forecast array."""
-        data: list[Forecast] = []
-        for offset in range(len(self.coordinator.data)):
-            data.append(
-                Forecast(
-                    condition=get_condition_from_here_data(
-                        self.coordinator.data, offset
-                    ),
-                    datetime=get_time_from_here_data(self.coordinator.data, offset),
-                    precipitation_probability=get_precipitation_probability(
-                        self.coordinator.data, self._mode, offset
-                    ),
-                    native_precipitation=calc_precipitation(
-                        self.coordinator.data, offset
-                    ),
-                    native_pressure=get_pressure_from_here_data(
-                        self.coordinator.data, self._mode, offset
-                    ),
-                    native_temperature=get_high_or_default_temperature_from_here_data(
-                        self.coordinator.data, self._mode, offset
-                    ),
-                    native_templow=get_low_or_default_temperature_from_here_data(
-                        self.coordinator.data, self._mode, offset
-                    ),
-                    wind_bearing=get_wind_bearing_from_here_data(
-                        self.coordinator.data, offset
-                    ),
-                    native_wind_speed=get_wind_speed_from_here_data(
-                        self.coordinator.data, offset
-                    ),
-                )
-            )
-        return data
-
-
-def get_wind_speed_from_here_data(here_data: list, offset: int = 0) -> float | None:
-    """Return the wind speed from here_data."""
-    if (
-        wind_speed := get_attribute_from_here_data(here_data, "windSpeed", offset)
-    ) is not None:
-        assert not isinstance(wind_speed, datetime)
-        return float(wind_speed)
-    return None
-
-
-def get_wind_bearing_from_here_data(here_data: list, offset: int = 0) -> int | None:
-    """Return the wind bearing from here_data."""
-    if (
-        wind_bearing := get_attribute_from_here_data(here_data, "windDirection", offset)
-    ) is not None:
-        assert isinstance(wind_bearing, int)
-        return wind_bearing
-    return None
-
-
-def get_time_from_here_data(here_data: list, offset: int = 0) -> datetime | None:
-    """Return the time from here_data."""
-    if (time := get_attribute_from_here_data(here_data, "time", offset)) is not None:
-        assert isinstance(time, datetime)
-        return time
-    return None
-
-
-def get_pressure_from_here_data(
-    here_data: list, mode: str, offset: int = 0
-) -> float | None:
-    """Return the pressure from here_data."""
-    if "barometerPressure" in SENSOR_TYPES[mode]:
-        if (
-            pressure := get_attribute_from_here_data(
-                here_data, "barometerPressure", offset
-            )
-        ) is not None:
-            assert not isinstance(pressure, datetime)
-            return float(pressure)
-    return None
-
-
-def get_precipitation_probability(
-    here_data: list, mode: str, offset: int = 0
-) -> int | None:
-    """Return the precipitation probability from here_data."""
-    if "precipitationProbability" in SENSOR_TYPES[mode]:
+        """Return the forecast array.
+
+        Home Assistant versions supporting forecast subscriptions fetch it
+        through async_forecast_daily and async_forecast_hourly instead, which
+        keeps it out of every state write.
+        """
+        if WeatherEntityFeature is not None:
+            return None
+        return self._get_forecast()
+
+    async def async_forecast_daily(self) -> list[Forecast] | None:
+        """Return the daily forecast."""
+        return self._get_forecast()
+
+    async def async_forecast_hourly(self) -> list[Forecast] | None:
+        """Return the hourly forecast."""
+        return self._get_forecast()
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the availability written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state and notify the forecast subscribers.
+
+        Nothing is written if neither the data of the mode nor the
+        availability of the entity changed, unless the data is stale and
+        its age has to be kept current.
+        """
+        available = self.available
+        stale = (
+            available and self.coordinator.async_data_age(self._data_key) is not None
+        )
         if (
-            precipitation_probability := get_attribute_from_here_data(
-                here_data, "precipitationProbability", offset
-            )
-        ) is not None:
-            assert isinstance(precipitation_probability, int)
-            return precipitation_probability
-    return None
-
-
-def get_condition_from_here_data(here_data: list, offset: int = 0) -> str | None:
-    """Return the condition from here_data."""
-    return next(
-        (
-            k
-            for k, v in CONDITION_CLASSES.items()
-            if get_attribute_from_here_data(here_data, "iconName", offset) in v
-        ),
-        None,
+            available == self._written_available
+            and not (stale or self._written_stale)
+            and not self.coordinator.async_has_changed(self._data_key)
+        ):
+            return
+        self._written_available = available
+        self._written_stale = stale
+        super()._handle_coordinator_update()
+        if FORECAST_FEATURES.get(self._mode) is not None:
+            self.hass.async_create_task(self.async_update_listeners(None))
+
+    def _get_forecast(self) -> list[Forecast]:
+        """Return the forecast array.
+
+        The forecast is only built again after the coordinator published new
+        data for the mode of this entity.
+        """
+        if self._forecast_source is not self._here_data:
+            self._forecast_source = self._here_data
+            self._forecast = self._build_forecast()
+        return self._forecast
+
+    def _build_forecast(self) -> list[Forecast]:
+        """Build the forecast array from the coordinator data."""
+        return [record_to_forecast(record) for record in self._here_data]
+
+    @callback
+    def async_get_forecast_at(
+        self, start: datetime, end: datetime | None = None, interpolate: bool = False
+    ) -> list[Forecast]:
+        """Return the forecast valid at start or the forecasts from start to end."""
+        time_index = self.coordinator.time_indexes[self._data_key]
+        if end is not None:
+            return [
+                record_to_forecast(record) for record in time_index.between(start, end)
+            ]
+        if (record := time_index.at(start, interpolate)) is None:
+            return []
+        return [record_to_forecast(record)]
+
+
+def record_to_forecast(record: HEREWeatherRecord) -> Forecast:
+    """Return the forecast of a record."""
+    return Forecast(
+        condition=record.condition,
+        datetime=record.time,
+        precipitation_probability=record.precipitation_probability,
+        native_precipitation=record.precipitation,
+        native_pressure=record.pressure,
+        native_temperature=record.high_temperature,
+        native_templow=record.low_temperature,
+        wind_bearing=record.wind_bearing,
+        native_wind_speed=record.wind_speed,
     )
-
-
-def get_high_or_default_temperature_from_here_data(
-    here_data: list, mode: str, offset: int = 0
-) -> float | None:
-    """Return the temperature from here_data."""
-    temperature = get_attribute_from_here_data(here_data, "highTemperature", offset)
-    if temperature is not None:
-        assert not isinstance(temperature, datetime)
-        return float(temperature)
-
-    return get_temperature_from_here_data(here_data, mode, offset)
-
-
-def get_low_or_default_temperature_from_here_data(
-    here_data: list, mode: str, offset: int = 0
-) -> float | None:
-    """Return the temperature from here_data."""
-    temperature = get_attribute_from_here_data(here_data, "lowTemperature", offset)
-    if temperature is not None:
-        assert not isinstance(temperature, datetime)
-        return float(temperature)
-    return get_temperature_from_here_data(here_data, mode, offset)
-
-
-def get_temperature_from_here_data(
-    here_data: list, mode: str, offset: int = 0
-) -> float | None:
-    """Return the temperature from here_data."""
-    if mode == MODE_DAILY_SIMPLE:
-        temperature = get_attribute_from_here_data(here_data, "highTemperature", offset)
-    else:
-        temperature = get_attribute_from_here_data(here_data, "temperature", offset)
-    if temperature is not None:
-        assert not isinstance(temperature, datetime)
-        return float(temperature)
-    return None
-
-
-def calc_precipitation(here_data: list, offset: int = 0) -> float | None:
-    """Calculate Precipitation."""
-    rain_fall = get_attribute_from_here_data(here_data, "rainFall", offset)
-    snow_fall = get_attribute_from_here_data(here_data, "snowFall", offset)
-    if rain_fall is not None and snow_fall is not None:
-        assert not isinstance(rain_fall, datetime)
-        assert not isinstance(snow_fall, datetime)
-        return float(rain_fall) + float(snow_fall)
-    return None
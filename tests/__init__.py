@@ -1,15 +1,21 @@
 """Tests for here_weather component."""
-import aiohere
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry
 
 from custom_components.here_weather.const import (
+    CONF_MODES,
+    DOMAIN,
     MODE_ASTRONOMY,
     MODE_DAILY,
     MODE_DAILY_SIMPLE,
     MODE_HOURLY,
     MODE_OBSERVATION,
+    SENSOR_TYPES,
 )
+from custom_components.here_weather.utils import get_unique_id
 
 from .const import (
+    MOCK_CONFIG,
     astronomy_response,
     daily_response,
     daily_simple_forecasts_response,
@@ -17,16 +23,31 @@ from .const import (
     observation_response,
 )
 
+MOCK_RESPONSES = {
+    MODE_ASTRONOMY: astronomy_response,
+    MODE_HOURLY: hourly_response,
+    MODE_DAILY: daily_response,
+    MODE_DAILY_SIMPLE: daily_simple_forecasts_response,
+    MODE_OBSERVATION: observation_response,
+}
+
 
 def mock_weather_for_coordinates(*args, **kwargs):  # noqa: F841
-    """Return mock data for request weather product type."""
-    if args[2] == [aiohere.WeatherProductType[MODE_ASTRONOMY]]:
-        return astronomy_response
-    if args[2] == [aiohere.WeatherProductType[MODE_HOURLY]]:
-        return hourly_response
-    if args[2] == [aiohere.WeatherProductType[MODE_DAILY]]:
-        return daily_response
-    if args[2] == [aiohere.WeatherProductType[MODE_DAILY_SIMPLE]]:
-        return daily_simple_forecasts_response
-    if args[2] == [aiohere.WeatherProductType[MODE_OBSERVATION]]:
-        return observation_response
+    """Return mock data for the requested weather product types."""
+    response = {}
+    for product_type in args[2]:
+        response.update(MOCK_RESPONSES[product_type.name])
+    return response
+
+
+def enable_sensors_for_all_modes(hass: HomeAssistant, config: dict = MOCK_CONFIG):
+    """Pre-create an enabled registry entry for a sensor of every mode."""
+    registry = entity_registry.async_get(hass)
+    for mode in CONF_MODES:
+        name = next(iter(SENSOR_TYPES[mode].values()))["name"]
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            get_unique_id(config, mode, name, 0),
+            disabled_by=None,
+        )
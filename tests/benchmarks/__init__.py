@@ -0,0 +1,102 @@
+"""Benchmarks for the here_weather integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import gc
+import time
+import tracemalloc
+
+
+def best_time(func: Callable[[], object], rounds: int = 20) -> float:
+    """Return the fastest of rounds calls of func in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Return the peak memory in bytes allocated during a call of func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scale_payload(payload: dict, key: str, factor: int) -> dict:
+    """Return a copy of a HERE payload with factor times as many elements.
+
+    Every copy of the elements is shifted in time so the timestamps stay unique.
+    """
+
+    def scale(elements: list[dict]) -> list[dict]:
+        span = timedelta(days=len(elements))
+        return [
+            {
+                **element,
+                "time": (
+                    datetime.fromisoformat(element["time"]) + span * copy
+                ).isoformat(),
+            }
+            for copy in range(factor)
+            for element in elements
+        ]
+
+    if key == "observations":
+        return {key: scale(payload[key])}
+    return {
+        key: [{**payload[key][0], "forecasts": scale(payload[key][0]["forecasts"])}]
+    }
+
+
+def retained_memory(func: Callable[[], object]) -> int:
+    """Return the memory in bytes still allocated by the result of func."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()  # noqa: F841 - kept alive until the memory is read
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+class LoopLagMonitor:
+    """Measure how long the event loop is blocked while the monitor runs.
+
+    A heartbeat sleeps for interval and the delay with which it wakes up is
+    counted as blocking time.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Initialize the monitor."""
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.total = 0.0
+        self.longest = 0.0
+
+    async def __aenter__(self) -> LoopLagMonitor:
+        """Start the heartbeat."""
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Stop the heartbeat."""
+        assert self._task is not None
+        self._task.cancel()
+
+    async def _heartbeat(self) -> None:
+        """Add up the delays of the heartbeat."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - expected
+            self.total += lag
+            self.longest = max(self.longest, lag)
@@ -0,0 +1,117 @@
+"""Local stand-in for the HERE weather endpoint serving the test fixtures."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import random
+
+import aiohere
+from aiohere import aiohere as aiohere_api
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.here_weather.const import CONF_MODES, PAYLOAD_KEYS
+
+from .. import MOCK_RESPONSES
+from . import scale_payload
+
+LatencyDistribution = Callable[[random.Random], float]
+
+
+def constant(seconds: float) -> LatencyDistribution:
+    """Return a latency distribution always taking seconds."""
+    return lambda _: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    """Return a latency distribution uniform between low and high seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> LatencyDistribution:
+    """Return a long-tailed latency distribution around median seconds."""
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+class MockHereServer:
+    """Serve the fixtures for the products requested like the HERE API does.
+
+    Every response is delayed by a sample of latency. With the probability
+    error_rate, a request fails with error_status instead. The forecasts
+    and observations are repeated payload_scale times.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyDistribution | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        payload_scale: int = 1,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server."""
+        self._latency = latency or constant(0)
+        self._error_rate = error_rate
+        self._error_status = error_status
+        self._random = random.Random(seed)
+        self._payloads = {
+            aiohere.WeatherProductType[mode].value: scale_payload(
+                MOCK_RESPONSES[mode], PAYLOAD_KEYS[mode], payload_scale
+            )
+            for mode in CONF_MODES
+        }
+        self._server: TestServer | None = None
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the weather endpoint."""
+        assert self._server is not None
+        return str(self._server.make_url(aiohere_api.API_PATH))
+
+    async def __aenter__(self) -> MockHereServer:
+        """Start the server on a free local port."""
+        app = web.Application()
+        app.router.add_get(aiohere_api.API_PATH, self._handle_report)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        """Stop the server."""
+        assert self._server is not None
+        await self._server.close()
+
+    async def _handle_report(self, request: web.Request) -> web.Response:
+        """Answer a weather report request."""
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._latency(self._random))
+            if self._random.random() < self._error_rate:
+                self.errors += 1
+                return _error_response(self._error_status)
+            place: dict = {}
+            for product in request.query["products"].split(","):
+                place.update(self._payloads[product])
+            return web.json_response({"places": [place]})
+        finally:
+            self.in_flight -= 1
+
+
+def _error_response(status: int) -> web.Response:
+    """Return an error response of the HERE API with status."""
+    if status == 400:
+        return web.json_response(
+            {"title": "Invalid Request", "cause": "Invalid location"}, status=status
+        )
+    if status == 401:
+        return web.json_response(
+            {"error": "Unauthorized", "error_description": "Invalid apiKey"},
+            status=status,
+        )
+    return web.Response(text="Service Unavailable", status=status)
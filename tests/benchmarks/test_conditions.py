@@ -0,0 +1,42 @@
+"""Benchmarks for resolving conditions from HERE icon names."""
+from custom_components.here_weather.const import CONDITION_CLASSES, ICON_CONDITIONS
+
+from ..const import hourly_response
+from . import best_time
+
+
+def _linear_scan_condition(icon_name: str) -> str | None:
+    """Resolve a condition the way it was done before ICON_CONDITIONS."""
+    return next(
+        (
+            condition
+            for condition, icons in CONDITION_CLASSES.items()
+            if icon_name in icons
+        ),
+        None,
+    )
+
+
+def test_icon_conditions_match_linear_scan():
+    """Test that the reverse index resolves every icon like the linear scan."""
+    for icons in CONDITION_CLASSES.values():
+        for icon in icons:
+            assert ICON_CONDITIONS[icon] == _linear_scan_condition(icon)
+    assert ICON_CONDITIONS.get("unknown_icon") is None
+
+
+def test_icon_conditions_speedup():
+    """Benchmark the reverse index against the linear scan on hourly.json."""
+    icons = [
+        forecast["iconName"]
+        for forecast in hourly_response["hourlyForecasts"][0]["forecasts"]
+    ]
+
+    linear = best_time(lambda: [_linear_scan_condition(icon) for icon in icons])
+    indexed = best_time(lambda: [ICON_CONDITIONS.get(icon) for icon in icons])
+
+    print(
+        f"Resolved {len(icons)} conditions in {linear * 1e6:.0f} µs with the "
+        f"linear scan and {indexed * 1e6:.0f} µs with the index "
+        f"({linear / indexed:.0f}x faster)"
+    )
@@ -0,0 +1,183 @@
+"""Benchmarks for the payload extraction and the entity hot paths."""
+from dataclasses import dataclass
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import aiohere
+import pytest
+
+from custom_components.here_weather import extract_data_from_payload_for_product_type
+from custom_components.here_weather.const import (
+    CONF_MODES,
+    MODE_ASTRONOMY,
+    PAYLOAD_KEYS,
+    SENSOR_TYPES,
+)
+from custom_components.here_weather.model import HEREWeatherRecord, value_table
+from custom_components.here_weather.sensor import HEREDestinationWeatherSensor
+from custom_components.here_weather.weather import HEREDestinationWeather
+
+from .. import MOCK_RESPONSES
+from ..const import MOCK_CONFIG, MOCK_LOCATION_ID
+from . import best_time, peak_memory, retained_memory, scale_payload
+
+FACTORS = [1, 10, 100]
+
+
+def _payload(mode: str, factor: int) -> dict:
+    """Return the fixture of a mode scaled by factor."""
+    return scale_payload(MOCK_RESPONSES[mode], PAYLOAD_KEYS[mode], factor)
+
+
+def _records(mode: str, factor: int) -> list:
+    """Return the records of the fixture of a mode scaled by factor."""
+    return extract_data_from_payload_for_product_type(
+        _payload(mode, factor), aiohere.WeatherProductType[mode]
+    )
+
+
+def _coordinator(mode: str, factor: int) -> MagicMock:
+    """Return a coordinator stand-in publishing the records of a mode."""
+    coordinator = MagicMock()
+    records = _records(mode, factor)
+    coordinator.data = {(MOCK_LOCATION_ID, mode): records}
+    coordinator.values = {
+        (MOCK_LOCATION_ID, mode): value_table(
+            records, [(name, 0) for name in SENSOR_TYPES[mode]]
+        )
+    }
+    return coordinator
+
+
+@pytest.mark.parametrize("factor", FACTORS)
+@pytest.mark.parametrize("mode", CONF_MODES)
+def test_extract_data_from_payload_for_product_type(mode, factor):
+    """Benchmark parsing a payload into records."""
+    payload = _payload(mode, factor)
+    product_type = aiohere.WeatherProductType[mode]
+
+    def extract():
+        return extract_data_from_payload_for_product_type(payload, product_type)
+
+    records = extract()
+    assert len(records) == len(_records(mode, 1)) * factor
+
+    _report("extract", mode, factor, len(records), extract)
+
+
+@pytest.mark.parametrize("factor", FACTORS)
+@pytest.mark.parametrize(
+    "mode", [mode for mode in CONF_MODES if mode != MODE_ASTRONOMY]
+)
+def test_weather_getters(mode, factor):
+    """Benchmark reading the state and the forecast of a weather entity."""
+    entity = HEREDestinationWeather(
+        MOCK_CONFIG,
+        _coordinator(mode, factor),
+        mode,
+    )
+
+    def read_state():
+        return (
+            entity.condition,
+            entity.native_temperature,
+            entity.native_pressure,
+            entity.native_wind_speed,
+            entity.wind_bearing,
+            entity.native_visibility,
+        )
+
+    forecast = entity._build_forecast()
+    assert entity.forecast == forecast
+    assert len(forecast) == len(entity.coordinator.data[(MOCK_LOCATION_ID, mode)])
+
+    _report("weather state", mode, factor, 1, read_state)
+    _report("weather forecast", mode, factor, len(forecast), entity._build_forecast)
+    _report("weather cached forecast", mode, factor, 1, lambda: entity.forecast)
+
+
+@pytest.mark.parametrize("factor", FACTORS)
+@pytest.mark.parametrize("mode", CONF_MODES)
+def test_sensor_native_value(mode, factor):
+    """Benchmark reading the state of every sensor of a mode."""
+    coordinator = _coordinator(mode, factor)
+    sensors = [
+        HEREDestinationWeatherSensor(MOCK_CONFIG, coordinator, mode, attribute)
+        for attribute in SENSOR_TYPES[mode]
+    ]
+
+    def read_states():
+        return [sensor.native_value for sensor in sensors]
+
+    assert any(value is not None for value in read_states())
+
+    _report("sensor native_value", mode, factor, len(sensors), read_states)
+
+
+@dataclass(slots=True)
+class _DuplicatedRecord:
+    """A record keeping the typed values next to the attributes, as it was."""
+
+    time: datetime | None
+    condition: str | None
+    temperature: float | None
+    high_temperature: float | None
+    low_temperature: float | None
+    pressure: float | None
+    wind_speed: float | None
+    wind_bearing: int | None
+    visibility: float | None
+    precipitation_probability: int | None
+    precipitation: float | None
+    attributes: dict
+
+    @classmethod
+    def from_record(cls, record: HEREWeatherRecord) -> "_DuplicatedRecord":
+        """Copy the typed values of a record next to its attributes."""
+        return cls(
+            record.time,
+            record.condition,
+            record.temperature,
+            record.high_temperature,
+            record.low_temperature,
+            record.pressure,
+            record.wind_speed,
+            record.wind_bearing,
+            record.visibility,
+            record.precipitation_probability,
+            record.precipitation,
+            record.attributes,
+        )
+
+
+@pytest.mark.parametrize(
+    "mode", [mode for mode in CONF_MODES if mode != MODE_ASTRONOMY]
+)
+def test_records_retained_memory(mode):
+    """Benchmark the memory retained by the records against the duplicated ones."""
+    payload = _payload(mode, 10)
+    product_type = aiohere.WeatherProductType[mode]
+
+    def extract():
+        return extract_data_from_payload_for_product_type(payload, product_type)
+
+    def extract_duplicated():
+        return [_DuplicatedRecord.from_record(record) for record in extract()]
+
+    memory_before = retained_memory(extract_duplicated)
+    memory_after = retained_memory(extract)
+    print(
+        f"retained records {mode} x10 ({len(extract())} items): "
+        f"{memory_before} B -> {memory_after} B"
+    )
+    assert memory_after < memory_before
+
+
+def _report(name, mode, factor, number_of_items, func) -> None:
+    """Print the time and peak memory of func."""
+    duration = best_time(func, rounds=max(2, 20 // factor))
+    memory = peak_memory(func)
+    print(
+        f"{name} {mode} x{factor} ({number_of_items} items): "
+        f"{duration * 1e6:.1f} µs, peak {memory} B"
+    )
@@ -0,0 +1,134 @@
+"""Load tests setting up many entries against a local stand-in for HERE."""
+import time
+from unittest.mock import patch
+
+from aiohere import aiohere as aiohere_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_NAME
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.here_weather.const import (
+    CONF_REQUESTS_PER_MINUTE,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
+    DEFAULT_MODE,
+    DOMAIN,
+)
+from custom_components.here_weather.instrumentation import RollingStatistics
+
+from ..const import MOCK_CONFIG
+from .mock_here_server import MockHereServer, lognormal, uniform
+
+NUMBERS_OF_ENTRIES = [10, 200]
+
+pytestmark = [
+    pytest.mark.benchmark,
+    # The stand-in for HERE listens on a local socket
+    pytest.mark.usefixtures("socket_enabled"),
+    # Raised by the request of aiohere itself
+    pytest.mark.filterwarnings(
+        "ignore:with timeout\\(\\) is deprecated:DeprecationWarning"
+    ),
+]
+
+
+def _entries(number_of_entries: int, shared_api_key: bool = True) -> list:
+    """Return config entries for locations far enough apart to be fetched apart."""
+    return [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                **MOCK_CONFIG,
+                CONF_API_KEY: "test" if shared_api_key else f"test {number}",
+                CONF_NAME: f"load {number}",
+                CONF_LATITUDE: round(MOCK_CONFIG[CONF_LATITUDE] + number / 100, 5),
+            },
+        )
+        for number in range(number_of_entries)
+    ]
+
+
+async def _async_setup_entries(hass, server: MockHereServer, entries: list) -> float:
+    """Set up the entries against server and return how long it took."""
+    for entry in entries:
+        entry.add_to_hass(hass)
+    with patch.object(aiohere_api, "API_URL", server.url):
+        start = time.perf_counter()
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_REQUESTS_PER_MINUTE: 10 * len(entries)}}
+        )
+        await hass.async_block_till_done()
+        return time.perf_counter() - start
+
+
+def _latencies(hass, entries: list) -> RollingStatistics:
+    """Return the request latencies measured by the loaded entries."""
+    latencies = RollingStatistics(window=len(entries))
+    for entry in entries:
+        if entry.state is ConfigEntryState.LOADED:
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            latencies.add(
+                coordinator.statistics[DEFAULT_MODE].latency.as_dict()["last"]
+            )
+    return latencies
+
+
+@pytest.mark.parametrize("number_of_entries", NUMBERS_OF_ENTRIES)
+async def test_setup_many_entries(hass, number_of_entries):
+    """Measure the throughput and tail latency of setting up many entries."""
+    entries = _entries(number_of_entries)
+    async with MockHereServer(latency=lognormal(0.02, 0.5)) as server:
+        duration = await _async_setup_entries(hass, server, entries)
+
+    assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+    assert server.requests == number_of_entries
+    assert server.max_in_flight <= DEFAULT_MAX_CONCURRENT_FETCHES
+    _report("setup", number_of_entries, duration, server, _latencies(hass, entries))
+
+
+async def test_setup_many_entries_with_errors(hass):
+    """Measure setting up entries while some requests to HERE fail."""
+    number_of_entries = 100
+    # Separate API keys keep one circuit breaker from failing all entries
+    entries = _entries(number_of_entries, shared_api_key=False)
+    async with MockHereServer(
+        latency=uniform(0.005, 0.05), error_rate=0.1, payload_scale=10
+    ) as server:
+        duration = await _async_setup_entries(hass, server, entries)
+
+    states = [entry.state for entry in entries]
+    assert server.errors > 0
+    # Entries whose first request failed may already have been retried
+    assert states.count(ConfigEntryState.LOADED) >= number_of_entries - server.errors
+    assert (
+        states.count(ConfigEntryState.LOADED)
+        + states.count(ConfigEntryState.SETUP_RETRY)
+        == number_of_entries
+    )
+    _report(
+        "setup with errors",
+        number_of_entries,
+        duration,
+        server,
+        _latencies(hass, entries),
+    )
+
+
+def _report(
+    name: str,
+    number_of_entries: int,
+    duration: float,
+    server: MockHereServer,
+    latencies: RollingStatistics,
+) -> None:
+    """Print the throughput and the latency percentiles of a load test."""
+    percentiles = latencies.as_dict()
+    print(
+        f"{name} x{number_of_entries}: {duration:.2f} s, "
+        f"{server.requests / duration:.0f} requests/s, "
+        f"{server.errors} errors, max {server.max_in_flight} in flight, latency "
+        + ", ".join(
+            f"{key} {percentiles[key] * 1e3:.1f} ms" for key in ("p50", "p90", "p99")
+        )
+    )
@@ -0,0 +1,104 @@
+"""Benchmarks for transforming the elements of HERE payloads."""
+import copy
+
+from homeassistant.util.dt import as_utc, parse_datetime
+import pytest
+
+from custom_components.here_weather import (
+    astronomy_data,
+    astronomy_data_with_utc,
+    parse_time_as_utc,
+)
+
+from ..const import (
+    astronomy_response,
+    daily_response,
+    daily_simple_forecasts_response,
+    hourly_response,
+    observation_response,
+)
+from . import best_time, peak_memory
+
+
+def _deepcopy_parse_time_as_utc(data):
+    """Parse the time of the elements the way it was done with deepcopy."""
+    result = copy.deepcopy(data)
+    for element in result:
+        element["time"] = as_utc(parse_datetime(element["time"]))
+    return result
+
+
+def _deepcopy_astronomy_data(data):
+    """Restructure astronomy data the way it was done with deepcopy."""
+    result = copy.deepcopy(data["forecasts"])
+    for element in result:
+        element["city"] = data["place"]["address"]["city"]
+        element["latitude"] = data["place"]["location"]["lat"]
+        element["longitude"] = data["place"]["location"]["lng"]
+        for key in ("sunRise", "sunSet", "moonRise", "moonSet"):
+            element[key] = astronomy_data_with_utc(key, element)
+    return result
+
+
+@pytest.mark.parametrize(
+    "elements",
+    [
+        pytest.param(hourly_response["hourlyForecasts"][0]["forecasts"], id="hourly"),
+        pytest.param(
+            daily_response["extendedDailyForecasts"][0]["forecasts"], id="daily"
+        ),
+        pytest.param(
+            daily_simple_forecasts_response["dailyForecasts"][0]["forecasts"],
+            id="daily_simple",
+        ),
+        pytest.param(observation_response["observations"], id="observation"),
+    ],
+)
+def test_parse_time_as_utc_without_deepcopy(elements):
+    """Benchmark parsing the time of every element against the deepcopy version."""
+    original = copy.deepcopy(elements)
+
+    assert list(parse_time_as_utc(elements)) == _deepcopy_parse_time_as_utc(elements)
+    assert elements == original
+
+    _report(
+        "parse_time_as_utc",
+        len(elements),
+        lambda: _deepcopy_parse_time_as_utc(elements),
+        lambda: list(parse_time_as_utc(elements)),
+    )
+
+
+def test_astronomy_data_without_deepcopy():
+    """Benchmark restructuring astronomy data against the deepcopy version."""
+    # Eight days are too few for the copies to stand out of the allocator noise
+    data = {
+        **astronomy_response["astronomyForecasts"][0],
+        "forecasts": [
+            dict(forecast)
+            for _ in range(10)
+            for forecast in astronomy_response["astronomyForecasts"][0]["forecasts"]
+        ],
+    }
+    original = copy.deepcopy(data)
+
+    assert list(astronomy_data(data)) == _deepcopy_astronomy_data(data)
+    assert data == original
+
+    _report(
+        "astronomy_data",
+        len(data["forecasts"]),
+        lambda: _deepcopy_astronomy_data(data),
+        lambda: list(astronomy_data(data)),
+    )
+
+
+def _report(name, number_of_elements, before, after) -> None:
+    """Print the time and peak memory before and after."""
+    time_before, time_after = best_time(before), best_time(after)
+    memory_before, memory_after = peak_memory(before), peak_memory(after)
+    print(
+        f"{name} for {number_of_elements} elements: "
+        f"{time_before * 1e6:.0f} µs -> {time_after * 1e6:.0f} µs, "
+        f"peak {memory_before} B -> {memory_after} B"
+    )
@@ -0,0 +1,147 @@
+"""Benchmarks of the steady-state refreshes of many config entries."""
+import copy
+from datetime import timedelta
+import gc
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from homeassistant.const import CONF_LATITUDE, CONF_NAME, EVENT_STATE_CHANGED
+from homeassistant.core import callback
+from homeassistant.helpers import storage
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.here_weather.const import (
+    CONF_MODES,
+    CONF_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    PAYLOAD_KEYS,
+)
+from custom_components.here_weather.instrumentation import SAMPLE_WINDOW
+
+from .. import MOCK_RESPONSES, enable_sensors_for_all_modes
+from ..const import MOCK_CONFIG
+
+NUMBER_OF_ENTRIES = 20
+CYCLES = 10
+# Cycles filling the rolling statistics, the caches and the free lists of the
+# interpreter before measuring
+WARMUP_CYCLES = SAMPLE_WINDOW + 10
+# Cycles between the two measurements of the allocated memory blocks
+MEASURED_CYCLES = 50
+# Memory blocks the allocations may differ by between the measurements, which
+# jump by a few hundred when containers of the interpreter resize. A leak of a
+# single block per entry and cycle exceeds it twice.
+MAX_GROWTH = 500
+
+
+def _with_changed_temperatures() -> dict:
+    """Return the responses with the temperatures of the first records raised."""
+    responses = copy.deepcopy(MOCK_RESPONSES)
+    for mode in CONF_MODES:
+        payload = responses[mode][PAYLOAD_KEYS[mode]][0]
+        record = payload["forecasts"][0] if "forecasts" in payload else payload
+        if isinstance(record.get("temperature"), float):
+            record["temperature"] += 1
+        if isinstance(record.get("highTemperature"), str):
+            record["highTemperature"] = f"{float(record['highTemperature']) + 1:.2f}"
+    return responses
+
+
+@pytest.mark.benchmark
+async def test_refresh_cycles(hass, hass_storage, freezer):
+    """Benchmark refreshing many entries and guard against memory growth.
+
+    Every cycle fetches all modes of all entries. The responses alternate
+    between two versions, so every cycle also writes states. The CPU time
+    includes firing the timers through the test helpers. The memory retained
+    by the setup is traced, the growth in steady state is counted in blocks
+    once the rolling statistics are full.
+    """
+    responses = [MOCK_RESPONSES, _with_changed_temperatures()]
+    cycle = 0
+    state_writes = 0
+
+    async def _weather_for_coordinates(_client, *args, **kwargs):
+        """Return the responses of the current cycle without recording calls."""
+        response = {}
+        for product_type in args[2]:
+            response.update(responses[cycle % 2][product_type.name])
+        return response
+
+    async def _async_write_data(store, _path, data) -> None:
+        """Write to the mocked storage without recording the calls."""
+        hass_storage[store.key] = data
+
+    @callback
+    def _count_state_write(_event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    async def _async_refresh_cycle() -> None:
+        nonlocal cycle
+        cycle += 1
+        freezer.tick(timedelta(days=1))
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    def _allocated_blocks() -> int:
+        gc.collect()
+        return sys.getallocatedblocks()
+
+    for number in range(NUMBER_OF_ENTRIES):
+        data = {
+            **MOCK_CONFIG,
+            CONF_NAME: f"refresh {number}",
+            CONF_LATITUDE: round(MOCK_CONFIG[CONF_LATITUDE] + number / 100, 5),
+        }
+        enable_sensors_for_all_modes(hass, data)
+        MockConfigEntry(domain=DOMAIN, data=data).add_to_hass(hass)
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates", new=_weather_for_coordinates
+    ), patch.object(storage.Store, "_async_write_data", new=_async_write_data):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            assert await async_setup_component(
+                hass, DOMAIN, {DOMAIN: {CONF_REQUESTS_PER_MINUTE: 1000}}
+            )
+            await hass.async_block_till_done()
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        state_writes = 0
+        start = time.process_time()
+        for _ in range(CYCLES):
+            await _async_refresh_cycle()
+        cpu_time = (time.process_time() - start) / CYCLES
+        writes_per_cycle = state_writes / CYCLES
+
+        # Compare cycles fetching the same responses. The allocated blocks
+        # are counted without tracemalloc, whose traces grow on their own.
+        for _ in range(WARMUP_CYCLES):
+            await _async_refresh_cycle()
+        before = _allocated_blocks()
+        for _ in range(MEASURED_CYCLES):
+            await _async_refresh_cycle()
+        growth = _allocated_blocks() - before
+
+    print(
+        f"refresh x{NUMBER_OF_ENTRIES}: {cpu_time * 1e3:.1f} ms CPU per cycle, "
+        f"{writes_per_cycle:.0f} state writes per cycle, "
+        f"{retained / NUMBER_OF_ENTRIES / 1024:.0f} KiB retained per entry, "
+        f"{growth} blocks growth over {MEASURED_CYCLES} cycles"
+    )
+    assert writes_per_cycle >= NUMBER_OF_ENTRIES
+    assert growth <= MAX_GROWTH
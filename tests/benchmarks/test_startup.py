@@ -0,0 +1,72 @@
+"""Benchmarks of the setup of many config entries."""
+import os
+import time
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_LATITUDE, CONF_NAME
+from homeassistant.helpers import entity_registry
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.here_weather.const import CONF_REQUESTS_PER_MINUTE, DOMAIN
+
+from .. import mock_weather_for_coordinates
+from ..const import MOCK_CONFIG
+from . import LoopLagMonitor
+
+NUMBERS_OF_ENTRIES = [
+    10,
+    100,
+    pytest.param(
+        500,
+        marks=pytest.mark.skipif(
+            "HERE_WEATHER_LARGE_BENCHMARKS" not in os.environ,
+            reason="Takes half a minute, set HERE_WEATHER_LARGE_BENCHMARKS to run",
+        ),
+    ),
+]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("number_of_entries", NUMBERS_OF_ENTRIES)
+async def test_setup_entries(hass, number_of_entries):
+    """Benchmark setting up many entries with mocked responses."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                **MOCK_CONFIG,
+                CONF_NAME: f"startup {number}",
+                CONF_LATITUDE: round(MOCK_CONFIG[CONF_LATITUDE] + number / 100, 5),
+            },
+        )
+        for number in range(number_of_entries)
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        async with LoopLagMonitor() as loop_lag:
+            start = time.perf_counter()
+            assert await async_setup_component(
+                hass,
+                DOMAIN,
+                {DOMAIN: {CONF_REQUESTS_PER_MINUTE: 10 * number_of_entries}},
+            )
+            await hass.async_block_till_done()
+            duration = time.perf_counter() - start
+
+    assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+    registered = len(entity_registry.async_get(hass).entities)
+    print(
+        f"setup x{number_of_entries}: {duration:.2f} s, "
+        f"{duration / number_of_entries * 1e3:.1f} ms per entry, "
+        f"{registered} entities registered, "
+        f"{len(hass.states.async_all())} states, event loop blocked "
+        f"{loop_lag.total:.2f} s, longest {loop_lag.longest * 1e3:.0f} ms"
+    )
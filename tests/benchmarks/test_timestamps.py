@@ -0,0 +1,115 @@
+"""Benchmarks for parsing the timestamps of HERE payloads."""
+from datetime import datetime
+
+from homeassistant.util.dt import as_utc, parse_datetime
+
+from custom_components.here_weather.utils import (
+    combine_utc_and_local,
+    parse_here_datetime,
+    parse_here_datetime_as_utc,
+    parse_here_local_time,
+)
+
+from ..const import astronomy_response, hourly_response
+from . import best_time
+
+TIMESTAMPS = [
+    forecast["time"] for forecast in hourly_response["hourlyForecasts"][0]["forecasts"]
+]
+ASTRONOMY = [
+    (forecast[key], forecast["time"])
+    for forecast in astronomy_response["astronomyForecasts"][0]["forecasts"]
+    for key in ("sunRise", "sunSet", "moonRise", "moonSet")
+    if key in forecast
+]
+
+
+def _uncached_combine_utc_and_local(local_time: str, utc: str) -> datetime | None:
+    """Combine local time and a utc timestamp the way it was done before caching."""
+    try:
+        local = datetime.strptime(local_time, "%H:%M:%S").time()
+    except ValueError:
+        return None
+    if (utc_date_time := parse_datetime(utc)) is None:
+        return None
+    return as_utc(datetime.combine(utc_date_time, local, utc_date_time.tzinfo))
+
+
+def _clear_caches() -> None:
+    """Clear the timestamp caches."""
+    parse_here_datetime.cache_clear()
+    parse_here_datetime_as_utc.cache_clear()
+    parse_here_local_time.cache_clear()
+
+
+def test_parse_here_datetime_as_utc_matches_parse_datetime():
+    """Test that the cached parser returns the same instants as parse_datetime."""
+    _clear_caches()
+    for timestamp in TIMESTAMPS:
+        assert parse_here_datetime_as_utc(timestamp) == as_utc(
+            parse_datetime(timestamp)
+        )
+    assert parse_here_datetime("2022-12-25T00:00:00.000Z") == parse_datetime(
+        "2022-12-25T00:00:00.000Z"
+    )
+    assert parse_here_datetime_as_utc("not a timestamp") is None
+
+
+def test_parse_here_datetime_shares_tzinfo_per_offset():
+    """Test that timestamps with the same offset share one tzinfo."""
+    _clear_caches()
+    first = parse_here_datetime("2022-12-25T00:00:00.000+01:00")
+    second = parse_here_datetime("2022-12-26T00:00:00.000+01:00")
+    assert first is not None and second is not None
+    assert first.tzinfo is second.tzinfo
+
+
+def test_combine_utc_and_local_matches_strptime():
+    """Test that the cached combination matches the strptime version."""
+    _clear_caches()
+    for local_time, utc in ASTRONOMY:
+        assert combine_utc_and_local(local_time, utc) == (
+            _uncached_combine_utc_and_local(local_time, utc)
+        )
+    assert combine_utc_and_local("25:00:00", ASTRONOMY[0][1]) is None
+    assert combine_utc_and_local("*", ASTRONOMY[0][1]) is None
+
+
+def test_timestamp_throughput():
+    """Benchmark timestamps per second of the cached parsers."""
+
+    def cold():
+        _clear_caches()
+        for timestamp in TIMESTAMPS:
+            parse_here_datetime_as_utc(timestamp)
+
+    def cold_astronomy():
+        _clear_caches()
+        for local_time, utc in ASTRONOMY:
+            combine_utc_and_local(local_time, utc)
+
+    baseline = best_time(
+        lambda: [as_utc(parse_datetime(timestamp)) for timestamp in TIMESTAMPS]
+    )
+    uncached = best_time(cold)
+    cached = best_time(
+        lambda: [parse_here_datetime_as_utc(timestamp) for timestamp in TIMESTAMPS]
+    )
+    astronomy_baseline = best_time(
+        lambda: [_uncached_combine_utc_and_local(*args) for args in ASTRONOMY]
+    )
+    astronomy_uncached = best_time(cold_astronomy)
+    astronomy_cached = best_time(
+        lambda: [combine_utc_and_local(*args) for args in ASTRONOMY]
+    )
+
+    print(
+        f"parse_time_as_utc: {len(TIMESTAMPS) / baseline:,.0f}/s with parse_datetime, "
+        f"{len(TIMESTAMPS) / uncached:,.0f}/s cold, "
+        f"{len(TIMESTAMPS) / cached:,.0f}/s cached"
+    )
+    print(
+        f"combine_utc_and_local: {len(ASTRONOMY) / astronomy_baseline:,.0f}/s "
+        f"with strptime, {len(ASTRONOMY) / astronomy_uncached:,.0f}/s cold, "
+        f"{len(ASTRONOMY) / astronomy_cached:,.0f}/s cached"
+    )
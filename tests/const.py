@@ -12,6 +12,7 @@ MOCK_CONFIG = {
     CONF_LATITUDE: 40.79962,
     CONF_LONGITUDE: -73.970314,
 }
+MOCK_LOCATION_ID = "40.79962_-73.970314"
 
 daily_simple_forecasts_response = json.loads(
     load_fixture("daily_simple_forecasts.json")
@@ -0,0 +1,221 @@
+"""Tests for the circuit breaker of the here_weather integration."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import aiohere
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_LATITUDE
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.here_weather.circuit_breaker import (
+    FAILURE_THRESHOLD,
+    TRANSIENT_RETRY,
+    UNAUTHORIZED_RETRY,
+    HERECircuitBreaker,
+    HERECircuitOpenError,
+    backoff_delay,
+)
+from custom_components.here_weather.const import CONF_LOCATIONS, DOMAIN
+from custom_components.here_weather.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.here_weather.rate_limit import HERERateLimitExceeded
+
+from . import mock_weather_for_coordinates
+from .const import MOCK_CONFIG
+
+
+@pytest.fixture(autouse=True)
+def no_jitter():
+    """Make the backoff delays predictable."""
+    with patch(
+        "custom_components.here_weather.circuit_breaker.random.uniform",
+        return_value=1,
+    ):
+        yield
+
+
+def test_backoff_delay():
+    """Test that the delay doubles up to the maximum."""
+    maximum = timedelta(minutes=5)
+    assert [
+        backoff_delay(timedelta(minutes=1), attempt, maximum) for attempt in range(1, 5)
+    ] == [timedelta(minutes=minutes) for minutes in (1, 2, 4, 5)]
+
+
+def test_backoff_delay_jitter():
+    """Test that the jitter spreads the delay over its upper half."""
+    with patch(
+        "custom_components.here_weather.circuit_breaker.random.uniform",
+        return_value=0.5,
+    ) as mock_uniform:
+        assert backoff_delay(timedelta(minutes=1), 2, timedelta(hours=1)) == timedelta(
+            minutes=1
+        )
+    mock_uniform.assert_called_once_with(0.5, 1)
+
+
+async def test_transient_errors_open_the_breaker(hass, freezer):
+    """Test that consecutive transient errors open the breaker."""
+    breaker = HERECircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.async_before_request()
+        breaker.async_record_failure(aiohere.HereTimeOutError("Timeout"))
+    assert breaker.state == "closed"
+
+    breaker.async_before_request()
+    breaker.async_record_failure(asyncio.TimeoutError())
+
+    assert breaker.state == "open"
+    assert breaker.retry_at == dt_util.utcnow() + TRANSIENT_RETRY
+    with pytest.raises(HERECircuitOpenError):
+        breaker.async_before_request()
+
+
+async def test_half_open_probe(hass, freezer):
+    """Test that a single probe is let through and decides about the breaker."""
+    breaker = HERECircuitBreaker()
+    breaker.async_record_failure(aiohere.HereUnauthorizedError("Unauthorized"))
+    assert breaker.state == "open"
+
+    freezer.tick(UNAUTHORIZED_RETRY)
+    breaker.async_before_request()
+    assert breaker.state == "half_open"
+    with pytest.raises(HERECircuitOpenError):
+        breaker.async_before_request()
+
+    breaker.async_record_failure(aiohere.HereError("Server error"))
+    assert breaker.state == "open"
+    assert breaker.retry_at == dt_util.utcnow() + 2 * TRANSIENT_RETRY
+
+    freezer.tick(2 * TRANSIENT_RETRY)
+    breaker.async_before_request()
+    breaker.async_record_success()
+    assert breaker.as_dict() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "retry_at": None,
+        "last_error": "HereError('Server error')",
+    }
+    breaker.async_before_request()
+    breaker.async_before_request()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        aiohere.HereInvalidRequestError("Invalid"),
+        HERERateLimitExceeded("Too many requests"),
+        asyncio.CancelledError(),
+    ],
+)
+async def test_errors_not_counted(hass, error):
+    """Test that errors not caused by HERE being unavailable are not counted."""
+    breaker = HERECircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.async_before_request()
+        breaker.async_record_failure(error)
+
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+async def test_breaker_pauses_the_requests_of_an_api_key(hass, freezer):
+    """Test that an open breaker stops the requests of all entries of a key."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1},
+    )
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        mock_request.reset_mock()
+        mock_request.side_effect = aiohere.HereUnauthorizedError("Unauthorized")
+        await hass.data[DOMAIN][entry.entry_id].async_refresh()
+        assert mock_request.call_count == 1
+
+        other_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(other_entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 1
+        assert other_entry.state is ConfigEntryState.SETUP_RETRY
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+        assert diagnostics["circuit_breaker"] == {
+            "state": "open",
+            "consecutive_failures": 0,
+            "retry_at": (dt_util.utcnow() + UNAUTHORIZED_RETRY).isoformat(),
+            "last_error": "HereUnauthorizedError('Unauthorized')",
+        }
+        assert diagnostics["entry"]["data"]["api_key"] == "**REDACTED**"
+        # Its setup retry would compete with the entry for the probe request
+        await hass.config_entries.async_remove(other_entry.entry_id)
+
+        mock_request.side_effect = mock_weather_for_coordinates
+        freezer.tick(UNAUTHORIZED_RETRY)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert mock_request.call_count == 2
+    assert hass.states.get("weather.here_weather_forecast_7days_simple").state == (
+        "snowy"
+    )
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["circuit_breaker"]["state"] == "closed"
+
+
+async def test_invalid_requests_back_off_per_location(hass, freezer):
+    """Test that a location with invalid requests backs off on its own."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={
+            CONF_LOCATIONS: [
+                {
+                    **MOCK_CONFIG,
+                    "name": "Location 1",
+                    CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1,
+                }
+            ]
+        },
+    )
+    entry.add_to_hass(hass)
+    failing_latitude = MOCK_CONFIG[CONF_LATITUDE] + 1
+
+    async def _fail_for_second_location(*args, **kwargs):
+        if args[0] == failing_latitude:
+            raise aiohere.HereInvalidRequestError("Invalid")
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=_fail_for_second_location,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        location_id = f"{failing_latitude}_{MOCK_CONFIG['longitude']}"
+        first_retry = coordinator._retry_after[location_id] - dt_util.utcnow()
+
+        freezer.tick(first_retry)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        second_retry = coordinator._retry_after[location_id] - dt_util.utcnow()
+
+    assert [call[0][0] for call in mock_request.call_args_list].count(
+        failing_latitude
+    ) == 2
+    assert second_retry == 2 * first_retry
+    assert coordinator.circuit_breaker.state == "closed"
@@ -3,10 +3,25 @@ from unittest.mock import patch
 
 import aiohere
 from homeassistant import config_entries, setup
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.here_weather.const import DOMAIN
+from custom_components.here_weather.const import (
+    CONF_LANGUAGE,
+    CONF_LOCATIONS,
+    CONF_NOWCAST,
+    CONF_NOWCAST_INTERPOLATE,
+    CONF_OFFSETS,
+    CONF_SCAN_INTERVALS,
+    DEFAULT_LANGUAGE,
+    DOMAIN,
+    MODE_ASTRONOMY,
+    MODE_DAILY,
+    MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
+    MODE_OBSERVATION,
+)
 
 from .const import MOCK_CONFIG
 
@@ -29,7 +44,7 @@ async def test_form(hass: HomeAssistant) -> None:
     ) as mock_setup_entry:
         existing_entry = MockConfigEntry(
             domain=DOMAIN,
-            data=MOCK_CONFIG,
+            data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1},
         )
         existing_entry.add_to_hass(hass)
         result2 = await hass.config_entries.flow.async_configure(
@@ -78,3 +93,201 @@ async def test_invalid_request(hass):
         )
         assert result["type"] == "form"
         assert result["errors"]["base"] == "invalid_request"
+
+
+async def test_options_flow(hass):
+    """Test that the options flow stores the scan intervals."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.here_weather.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == "menu"
+        assert result["step_id"] == "init"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"next_step_id": "settings"}
+        )
+        assert result["type"] == "form"
+        assert result["step_id"] == "settings"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={
+                CONF_LANGUAGE: DEFAULT_LANGUAGE,
+                CONF_SCAN_INTERVALS[MODE_OBSERVATION]: 30,
+                CONF_NOWCAST: True,
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == "create_entry"
+    assert entry.options[CONF_SCAN_INTERVALS[MODE_OBSERVATION]] == 30
+    assert entry.options[CONF_NOWCAST] is True
+    assert entry.options[CONF_NOWCAST_INTERPOLATE] is False
+
+
+async def test_options_flow_offsets(hass):
+    """Test that the options flow stores the offsets sensors are created for."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LANGUAGE: DEFAULT_LANGUAGE}
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.here_weather.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"next_step_id": "offsets"}
+        )
+        assert result["step_id"] == "offsets"
+        assert CONF_OFFSETS[MODE_OBSERVATION] not in result["data_schema"].schema
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_OFFSETS[MODE_HOURLY]: ["12", "0", "1"]},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == "create_entry"
+    assert entry.options == {
+        CONF_LANGUAGE: DEFAULT_LANGUAGE,
+        CONF_OFFSETS[MODE_ASTRONOMY]: [0],
+        CONF_OFFSETS[MODE_HOURLY]: [0, 1, 12],
+        CONF_OFFSETS[MODE_DAILY]: [0],
+        CONF_OFFSETS[MODE_DAILY_SIMPLE]: [0],
+    }
+
+
+SECOND_LOCATION = {
+    CONF_NAME: "second",
+    CONF_LATITUDE: 41.85003,
+    CONF_LONGITUDE: -87.65005,
+}
+
+
+async def _configure_location_step(hass, entry, step_id: str, user_input: dict):
+    """Run an options flow through the menu into step_id with user_input."""
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": step_id}
+    )
+    assert result["step_id"] == step_id
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input
+    )
+
+
+async def test_options_flow_add_location(hass):
+    """Test that a location can be added and validated in the options flow."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LANGUAGE: DEFAULT_LANGUAGE}
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.here_weather.async_setup_entry",
+        return_value=True,
+    ), patch(
+        "aiohere.AioHere.weather_for_coordinates", return_value=None
+    ) as mock_request:
+        result = await _configure_location_step(
+            hass,
+            entry,
+            "add_location",
+            {
+                CONF_NAME: "duplicate",
+                CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE],
+                CONF_LONGITUDE: MOCK_CONFIG[CONF_LONGITUDE],
+            },
+        )
+        assert result["type"] == "form"
+        assert result["errors"]["base"] == "already_configured"
+        assert mock_request.call_count == 0
+
+        result = await _configure_location_step(
+            hass, entry, "add_location", SECOND_LOCATION
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == "create_entry"
+    assert mock_request.call_args[0][:2] == (41.85003, -87.65005)
+    assert entry.options == {
+        CONF_LANGUAGE: DEFAULT_LANGUAGE,
+        CONF_LOCATIONS: [SECOND_LOCATION],
+    }
+
+
+async def test_location_of_another_entry_is_rejected(hass):
+    """Test that a location can not be configured in two entries."""
+    MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LOCATIONS: [SECOND_LOCATION]}
+    ).add_to_hass(hass)
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1},
+    )
+    other_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.here_weather.async_setup_entry",
+        return_value=True,
+    ), patch(
+        "aiohere.AioHere.weather_for_coordinates", return_value=None
+    ) as mock_request:
+        main_location = {
+            key: MOCK_CONFIG[key] for key in (CONF_NAME, CONF_LATITUDE, CONF_LONGITUDE)
+        }
+        for location in (main_location, SECOND_LOCATION):
+            result = await _configure_location_step(
+                hass, other_entry, "add_location", location
+            )
+            assert result["type"] == "form"
+            assert result["errors"]["base"] == "already_configured"
+
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {**MOCK_CONFIG, **SECOND_LOCATION}
+        )
+
+    assert result["type"] == "abort"
+    assert result["reason"] == "already_configured"
+    assert mock_request.call_count == 0
+
+
+async def test_options_flow_remove_location(hass):
+    """Test that an added location can be removed in the options flow."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "remove_location"}
+    )
+    assert result["type"] == "abort"
+    assert result["reason"] == "no_locations"
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_LOCATIONS: [SECOND_LOCATION]}
+    )
+    with patch(
+        "custom_components.here_weather.async_setup_entry",
+        return_value=True,
+    ):
+        result = await _configure_location_step(
+            hass,
+            entry,
+            "remove_location",
+            {CONF_LOCATIONS: "41.85003_-87.65005"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == "create_entry"
+    assert entry.options == {CONF_LOCATIONS: []}
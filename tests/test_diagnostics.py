@@ -0,0 +1,142 @@
+"""Tests for the diagnostics of the here_weather integration."""
+import json
+from unittest.mock import patch
+
+import aiohere
+from aiohere import aiohere as aiohere_api
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.here_weather.const import (
+    CONF_LOCATIONS,
+    DEFAULT_MODE,
+    DOMAIN,
+    MODE_HOURLY,
+)
+from custom_components.here_weather.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.here_weather.instrumentation import RollingStatistics
+
+from . import MOCK_RESPONSES, mock_weather_for_coordinates
+from .benchmarks.mock_here_server import MockHereServer
+from .const import MOCK_CONFIG, MOCK_LOCATION_ID
+
+
+def test_rolling_statistics():
+    """Test the percentiles over the window of the latest samples."""
+    statistics = RollingStatistics(window=100)
+    assert statistics.as_dict() == {"count": 0}
+
+    for value in range(150, 0, -1):
+        statistics.add(value)
+
+    assert statistics.as_dict() == {
+        "count": 150,
+        "last": 1,
+        "p50": 50,
+        "p90": 90,
+        "p99": 99,
+        "max": 100,
+    }
+
+
+async def test_diagnostics(hass, freezer):
+    """Test that the diagnostics contain the statistics of every mode."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        fetched = dt_util.utcnow()
+
+        freezer.tick(60)
+        mock_request.side_effect = aiohere.HereInvalidRequestError("Invalid")
+        # The first listener of a mode which has no data yet requests it
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        coordinator.async_add_listener(lambda: None, (MOCK_LOCATION_ID, MODE_HOURLY))
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["api_key"] == "**REDACTED**"
+    assert diagnostics["rate_limiter"]["counters"]["requests"] == 2
+    daily_simple = diagnostics["modes"][DEFAULT_MODE]
+    assert daily_simple["latency"]["count"] == 1
+    assert daily_simple["parse_time"]["count"] == 1
+    assert daily_simple["records"] == {
+        "count": 1,
+        "last": 7,
+        "p50": 7,
+        "p90": 7,
+        "p99": 7,
+        "max": 7,
+    }
+    # The mocked requests read no response
+    assert daily_simple["response_size"] == {"count": 0}
+    assert daily_simple["last_success"] == fetched.isoformat()
+    assert daily_simple["last_failure"] is None
+    hourly = diagnostics["modes"][MODE_HOURLY]
+    assert hourly["latency"] == {"count": 0}
+    assert hourly["response_size"] == {"count": 0}
+    assert hourly["last_failure"] == dt_util.utcnow().isoformat()
+    assert hourly["last_error"] == "HereInvalidRequestError('Invalid')"
+
+
+EXTRA_LOCATION = {
+    CONF_NAME: "cottage",
+    CONF_LATITUDE: 41.85003,
+    CONF_LONGITUDE: -87.65005,
+}
+
+
+async def test_diagnostics_redact_locations(hass):
+    """Test that neither the coordinates nor the names of the locations leak."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        title=MOCK_CONFIG[CONF_NAME],
+        unique_id=f"{MOCK_CONFIG[CONF_LATITUDE]}_{MOCK_CONFIG[CONF_LONGITUDE]}",
+        options={CONF_LOCATIONS: [EXTRA_LOCATION]},
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    dump = json.dumps(await async_get_config_entry_diagnostics(hass, entry))
+
+    for location in (MOCK_CONFIG, EXTRA_LOCATION):
+        assert str(location[CONF_LATITUDE]) not in dump
+        assert str(location[CONF_LONGITUDE]) not in dump
+    assert EXTRA_LOCATION[CONF_NAME] not in dump
+
+
+@pytest.mark.usefixtures("socket_enabled")
+@pytest.mark.filterwarnings(
+    "ignore:with timeout\\(\\) is deprecated:DeprecationWarning"
+)
+async def test_diagnostics_response_size(hass):
+    """Test that the size of the responses read from HERE is recorded."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    async with MockHereServer() as server:
+        with patch.object(aiohere_api, "API_URL", server.url):
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    response_size = diagnostics["modes"][DEFAULT_MODE]["response_size"]
+    assert response_size["count"] == 1
+    assert response_size["last"] == len(
+        json.dumps({"places": [MOCK_RESPONSES[DEFAULT_MODE]]})
+    )
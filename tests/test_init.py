@@ -1,12 +1,52 @@
 """Tests for the here_weather integration."""
-from unittest.mock import patch
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+import aiohere
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+from homeassistant.helpers import entity_registry
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.here_weather.const import CONF_LANGUAGE, DOMAIN
+from custom_components.here_weather.const import (
+    ATTR_DATA_AGE,
+    CONF_LANGUAGE,
+    CONF_LOCATION_PRECISION,
+    CONF_LOCATIONS,
+    CONF_MAX_CONCURRENT_FETCHES,
+    CONF_MAX_CONCURRENT_SETUPS,
+    CONF_MODES,
+    DEFAULT_LANGUAGE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MODE,
+    DEFAULT_SCAN_INTERVALS,
+    DOMAIN,
+    LANGUAGES,
+    MODE_DAILY,
+    MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
+    MODE_OBSERVATION,
+    PAYLOAD_KEYS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
 
-from . import mock_weather_for_coordinates
-from .const import MOCK_CONFIG
+from custom_components.here_weather import FAILED_LOCATION_RETRY, HEREWeatherFetcher
+from custom_components.here_weather.utils import get_refresh_phase, get_unique_id
+
+from . import (
+    MOCK_RESPONSES,
+    enable_sensors_for_all_modes,
+    mock_weather_for_coordinates,
+)
+from .const import MOCK_CONFIG, MOCK_LOCATION_ID
 
 
 async def test_unload_entry(hass):
@@ -46,3 +86,653 @@ async def test_migrate_entry_v1(hass, caplog):
             "The configured language was reset. Please configure it again."
             in caplog.text
         )
+
+
+async def test_single_request_for_all_modes(hass):
+    """Test that all modes of an entry are fetched with a single request."""
+    enable_sensors_for_all_modes(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data=MOCK_CONFIG,
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_request.call_count == 1
+        assert {
+            product_type.name for product_type in mock_request.call_args[0][2]
+        } == set(CONF_MODES)
+        assert set(hass.data[DOMAIN][entry.entry_id].data) == {
+            (MOCK_LOCATION_ID, mode) for mode in CONF_MODES
+        }
+
+
+RESPONSE_DELAY = 0.2
+
+
+class DelayedWeatherForCoordinates:
+    """Mock for a slow HERE API that tracks the number of requests in flight."""
+
+    def __init__(self) -> None:
+        """Initialize the mock."""
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def weather_for_coordinates(self, *args, **kwargs):
+        """Return mock data after a delay."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(RESPONSE_DELAY)
+        finally:
+            self.in_flight -= 1
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+
+async def _time_setup_of_entries(
+    hass, number_of_entries: int, config: dict
+) -> tuple[float, DelayedWeatherForCoordinates]:
+    """Set up several entries at once and return the wall-clock time it took."""
+    for number in range(number_of_entries):
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + number},
+        ).add_to_hass(hass)
+    delayed_mock = DelayedWeatherForCoordinates()
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=delayed_mock.weather_for_coordinates,
+    ):
+        start = time.monotonic()
+        assert await async_setup_component(hass, DOMAIN, config)
+        await hass.async_block_till_done()
+        return time.monotonic() - start, delayed_mock
+
+
+async def test_entries_refresh_concurrently(hass):
+    """Test that the first refresh of several entries runs concurrently."""
+    elapsed, delayed_mock = await _time_setup_of_entries(hass, 4, {})
+
+    assert len(hass.data[DOMAIN]) == 4
+    assert delayed_mock.max_in_flight == 4
+    assert elapsed < 4 * RESPONSE_DELAY
+
+
+async def test_concurrent_setups_are_capped(hass):
+    """Test that the number of concurrent first refreshes can be limited."""
+    elapsed, delayed_mock = await _time_setup_of_entries(
+        hass, 4, {DOMAIN: {CONF_MAX_CONCURRENT_SETUPS: 2}}
+    )
+
+    assert len(hass.data[DOMAIN]) == 4
+    assert delayed_mock.max_in_flight == 2
+    assert elapsed >= 2 * RESPONSE_DELAY
+
+
+async def test_failed_first_refresh_retries_setup(hass):
+    """Test that a failing first refresh puts only that entry into setup retry."""
+    failing_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    failing_entry.add_to_hass(hass)
+    working_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1},
+    )
+    working_entry.add_to_hass(hass)
+
+    async def _fail_for_first_entry(*args, **kwargs):
+        if args[0] == MOCK_CONFIG[CONF_LATITUDE]:
+            raise aiohere.HereInvalidRequestError("Invalid")
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=_fail_for_first_entry,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+
+    assert failing_entry.state is ConfigEntryState.SETUP_RETRY
+    assert working_entry.state is ConfigEntryState.LOADED
+
+
+def _store_key(entry: MockConfigEntry, mode: str) -> str:
+    return f"{DOMAIN}.{entry.entry_id}.{MOCK_LOCATION_ID}.{mode.lower()}"
+
+
+def _cache_modes(hass_storage, entry: MockConfigEntry, fetched) -> None:
+    """Fill the storage with cached payloads for all modes."""
+    for mode in CONF_MODES:
+        hass_storage[_store_key(entry, mode)] = {
+            "version": STORAGE_VERSION,
+            "key": _store_key(entry, mode),
+            "data": {
+                "language": LANGUAGES[DEFAULT_LANGUAGE],
+                "fetched": fetched[mode].isoformat(),
+                "payload": {
+                    PAYLOAD_KEYS[mode]: MOCK_RESPONSES[mode][PAYLOAD_KEYS[mode]]
+                },
+            },
+        }
+
+
+async def test_fresh_cache_skips_request(hass, hass_storage):
+    """Test that entities are set up from a fresh cache without a request."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    _cache_modes(hass_storage, entry, {mode: dt_util.utcnow() for mode in CONF_MODES})
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_request.call_count == 0
+        assert set(hass.data[DOMAIN][entry.entry_id].data) == {
+            (MOCK_LOCATION_ID, mode) for mode in CONF_MODES
+        }
+        sensor = hass.states.get("weather.here_weather_forecast_7days_simple")
+        assert sensor.state == "snowy"
+
+
+async def test_expired_cache_is_refreshed(hass, hass_storage):
+    """Test that only modes with expired cached data are requested."""
+    enable_sensors_for_all_modes(hass)
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    fetched = {mode: dt_util.utcnow() for mode in CONF_MODES}
+    fetched[MODE_HOURLY] -= timedelta(minutes=DEFAULT_SCAN_INTERVALS[MODE_HOURLY])
+    _cache_modes(hass_storage, entry, fetched)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_request.call_count == 1
+        assert [product_type.name for product_type in mock_request.call_args[0][2]] == [
+            MODE_HOURLY
+        ]
+
+
+async def test_fetched_data_is_cached(hass, hass_storage):
+    """Test that fetched payloads are written to the cache."""
+    enable_sensors_for_all_modes(hass)
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+    cached = hass_storage[_store_key(entry, MODE_HOURLY)]["data"]
+    assert cached["language"] == LANGUAGES[DEFAULT_LANGUAGE]
+    assert cached["payload"] == {
+        PAYLOAD_KEYS[MODE_HOURLY]: MOCK_RESPONSES[MODE_HOURLY][
+            PAYLOAD_KEYS[MODE_HOURLY]
+        ]
+    }
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert _store_key(entry, MODE_HOURLY) not in hass_storage
+
+
+async def test_modes_are_polled_at_their_own_interval(hass, freezer):
+    """Test that every mode is fetched again once its interval is aligned."""
+    enable_sensors_for_all_modes(hass)
+    hass.config.set_time_zone("UTC")
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    phase = get_refresh_phase(
+        entry.entry_id,
+        timedelta(minutes=min(DEFAULT_SCAN_INTERVALS.values())),
+    )
+    start = dt_util.parse_datetime("2023-01-01 12:05:00+00:00") + phase
+    freezer.move_to(start)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 1
+
+        for minutes, expected_modes in (
+            (10, {MODE_OBSERVATION}),
+            (25, {MODE_OBSERVATION}),
+            (55, {MODE_OBSERVATION, MODE_HOURLY}),
+            (
+                175,
+                {MODE_OBSERVATION, MODE_HOURLY, MODE_DAILY, MODE_DAILY_SIMPLE},
+            ),
+            (715, set(CONF_MODES)),
+        ):
+            mock_request.reset_mock()
+            freezer.move_to(start + timedelta(minutes=minutes))
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+            assert mock_request.call_count == 1
+            assert {
+                product_type.name for product_type in mock_request.call_args[0][2]
+            } == expected_modes
+
+
+def test_refresh_phases_spread_entries():
+    """Test that the refresh phase is stable and differs between entries."""
+    period = timedelta(minutes=15)
+    phases = {get_refresh_phase(f"entry {number}", period) for number in range(100)}
+    assert len(phases) > 50
+    assert all(timedelta(0) <= phase < period for phase in phases)
+    assert get_refresh_phase("entry 0", period) == get_refresh_phase("entry 0", period)
+
+
+async def test_only_modes_with_enabled_entities_are_polled(hass):
+    """Test that modes without enabled entities are not requested."""
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert [product_type.name for product_type in mock_request.call_args[0][2]] == [
+            DEFAULT_MODE
+        ]
+        assert set(hass.data[DOMAIN][entry.entry_id].data) == {
+            (MOCK_LOCATION_ID, DEFAULT_MODE)
+        }
+
+        mock_request.reset_mock()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(days=2))
+        await hass.async_block_till_done()
+        assert [product_type.name for product_type in mock_request.call_args[0][2]] == [
+            DEFAULT_MODE
+        ]
+
+
+async def test_polling_stops_without_entities(hass):
+    """Test that a mode is no longer requested once its entities are removed."""
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        entity_registry.async_get(hass).async_remove(
+            "weather.here_weather_forecast_7days_simple"
+        )
+        await hass.async_block_till_done()
+
+        mock_request.reset_mock()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(days=2))
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 0
+
+
+def _locations(number_of_locations: int) -> list[dict]:
+    """Return additional locations next to the one of MOCK_CONFIG."""
+    return [
+        {
+            CONF_NAME: f"location {number}",
+            CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + number,
+            CONF_LONGITUDE: MOCK_CONFIG[CONF_LONGITUDE],
+        }
+        for number in range(1, number_of_locations + 1)
+    ]
+
+
+async def test_locations_of_an_entry_are_fetched_separately(hass):
+    """Test that every location of an entry gets its own request and entities."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LOCATIONS: _locations(2)}
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert sorted(call[0][0] for call in mock_request.call_args_list) == [
+        MOCK_CONFIG[CONF_LATITUDE] + number for number in range(3)
+    ]
+    assert set(hass.data[DOMAIN][entry.entry_id].data) == {
+        (MOCK_LOCATION_ID, DEFAULT_MODE),
+        ("41.79962_-73.970314", DEFAULT_MODE),
+        ("42.79962_-73.970314", DEFAULT_MODE),
+    }
+    assert hass.states.get("weather.here_weather_forecast_7days_simple").state == (
+        "snowy"
+    )
+    assert hass.states.get("weather.location_1_forecast_7days_simple").state == "snowy"
+    assert hass.states.get("weather.location_2_forecast_7days_simple").state == "snowy"
+
+
+async def test_failing_location_is_isolated(hass, freezer):
+    """Test that a failing location neither fails the entry nor the others."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LOCATIONS: _locations(1)}
+    )
+    entry.add_to_hass(hass)
+    failing_latitude = MOCK_CONFIG[CONF_LATITUDE] + 1
+
+    async def _fail_for_second_location(*args, **kwargs):
+        if args[0] == failing_latitude:
+            raise aiohere.HereInvalidRequestError("Invalid")
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=_fail_for_second_location,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.states.get("weather.here_weather_forecast_7days_simple").state == (
+            "snowy"
+        )
+        assert hass.states.get("weather.location_1_forecast_7days_simple").state == (
+            "unavailable"
+        )
+
+        mock_request.reset_mock()
+        mock_request.side_effect = mock_weather_for_coordinates
+        freezer.tick(FAILED_LOCATION_RETRY)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert [call[0][0] for call in mock_request.call_args_list] == [failing_latitude]
+    assert hass.states.get("weather.location_1_forecast_7days_simple").state == "snowy"
+
+
+async def test_failing_location_does_not_fail_the_entry(hass, freezer):
+    """Test that the other locations stay available while one keeps failing."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LOCATIONS: _locations(1)}
+    )
+    entry.add_to_hass(hass)
+    failing_latitude = MOCK_CONFIG[CONF_LATITUDE] + 1
+
+    async def _fail_for_second_location(*args, **kwargs):
+        if args[0] == failing_latitude:
+            raise aiohere.HereInvalidRequestError("Invalid")
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=_fail_for_second_location,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        mock_request.reset_mock()
+        freezer.tick(FAILED_LOCATION_RETRY)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert [call[0][0] for call in mock_request.call_args_list] == [failing_latitude]
+    assert hass.data[DOMAIN][entry.entry_id].last_update_success
+    assert hass.states.get("weather.here_weather_forecast_7days_simple").state == (
+        "snowy"
+    )
+    assert hass.states.get("weather.location_1_forecast_7days_simple").state == (
+        "unavailable"
+    )
+
+
+async def test_expired_mode_does_not_affect_servable_modes(hass, freezer):
+    """Test that a mode past max staleness leaves the servable modes available."""
+    entity_registry.async_get(hass).async_get_or_create(
+        "weather",
+        DOMAIN,
+        get_unique_id(MOCK_CONFIG, MODE_OBSERVATION),
+        suggested_object_id="here_weather_observation",
+        disabled_by=None,
+    )
+    hass.config.set_time_zone("UTC")
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    phase = get_refresh_phase(
+        entry.entry_id,
+        timedelta(minutes=min(DEFAULT_SCAN_INTERVALS.values())),
+    )
+    # The daily forecast gets stale at 15:00 and the observation at 12:15
+    freezer.move_to(dt_util.parse_datetime("2023-01-01 12:05:00+00:00") + phase)
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        daily_stale_since = coordinator._stale_since((MOCK_LOCATION_ID, DEFAULT_MODE))
+        mock_request.side_effect = aiohere.HereInvalidRequestError("Invalid")
+
+        # The observation expires long before the daily forecast gets stale
+        while dt_util.utcnow() < daily_stale_since + timedelta(minutes=5):
+            freezer.tick(timedelta(minutes=5))
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+            weather = hass.states.get("weather.here_weather_forecast_7days_simple")
+            assert weather.state == "snowy"
+        # The retries of the location back off, so refresh to write the states
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get("weather.here_weather_observation").state == "unavailable"
+    weather = hass.states.get("weather.here_weather_forecast_7days_simple")
+    assert weather.state == "snowy"
+    assert weather.attributes[ATTR_DATA_AGE] > 0
+    assert dt_util.utcnow() < daily_stale_since + timedelta(
+        minutes=DEFAULT_MAX_STALENESS
+    )
+
+
+async def test_concurrent_fetches_are_capped(hass):
+    """Test that the locations of an entry are fetched with bounded concurrency."""
+    MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_LOCATIONS: _locations(5)}
+    ).add_to_hass(hass)
+    delayed_mock = DelayedWeatherForCoordinates()
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=delayed_mock.weather_for_coordinates,
+    ) as mock_request:
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_MAX_CONCURRENT_FETCHES: 2}}
+        )
+        await hass.async_block_till_done()
+
+    assert mock_request.call_count == 6
+    assert delayed_mock.max_in_flight == 2
+
+
+async def test_throttled_requests_do_not_hold_a_fetch_slot():
+    """Test that a request waiting for the rate limiter leaves the fetch slot free."""
+    fetcher = HEREWeatherFetcher(1)
+    here_client = MagicMock()
+    here_client.weather_for_coordinates = AsyncMock(
+        side_effect=mock_weather_for_coordinates
+    )
+    released = asyncio.Event()
+    throttled_fetch = asyncio.create_task(
+        fetcher.async_fetch(
+            here_client,
+            MagicMock(async_acquire=AsyncMock(side_effect=released.wait)),
+            MagicMock(),
+            1.0,
+            2.0,
+            [DEFAULT_MODE],
+            DEFAULT_LANGUAGE,
+            lambda *_: False,
+        )
+    )
+    await asyncio.sleep(0)
+
+    results, _ = await asyncio.wait_for(
+        fetcher.async_fetch(
+            here_client,
+            MagicMock(async_acquire=AsyncMock()),
+            MagicMock(),
+            3.0,
+            4.0,
+            [DEFAULT_MODE],
+            DEFAULT_LANGUAGE,
+            lambda *_: False,
+        ),
+        1,
+    )
+    assert results[DEFAULT_MODE].records
+
+    released.set()
+    await throttled_fetch
+    assert here_client.weather_for_coordinates.call_count == 2
+
+
+async def test_results_are_stamped_when_the_response_arrived(freezer):
+    """Test that results are stamped with the time the response arrived."""
+    requested = dt_util.utcnow()
+
+    def slow_weather_for_coordinates(*args, **kwargs):
+        freezer.tick(timedelta(seconds=5))
+        return mock_weather_for_coordinates(*args, **kwargs)
+
+    here_client = MagicMock()
+    here_client.weather_for_coordinates = AsyncMock(
+        side_effect=slow_weather_for_coordinates
+    )
+    results, _ = await HEREWeatherFetcher(1).async_fetch(
+        here_client,
+        MagicMock(async_acquire=AsyncMock()),
+        MagicMock(),
+        1.0,
+        2.0,
+        [DEFAULT_MODE],
+        DEFAULT_LANGUAGE,
+        lambda *_: False,
+    )
+
+    assert results[DEFAULT_MODE].fetched == requested + timedelta(seconds=5)
+
+
+NEARBY_CONFIG = {
+    **MOCK_CONFIG,
+    CONF_NAME: "nearby",
+    CONF_LATITUDE: 40.80031,
+    CONF_LONGITUDE: -73.971206,
+}
+
+
+async def test_nearby_entries_share_requests(hass):
+    """Test that entries in the same spatial bucket share one request."""
+    MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG).add_to_hass(hass)
+    MockConfigEntry(domain=DOMAIN, data=NEARBY_CONFIG).add_to_hass(hass)
+    delayed_mock = DelayedWeatherForCoordinates()
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=delayed_mock.weather_for_coordinates,
+    ) as mock_request:
+        assert await async_setup_component(
+            hass, DOMAIN, {DOMAIN: {CONF_LOCATION_PRECISION: 2}}
+        )
+        await hass.async_block_till_done()
+
+    assert mock_request.call_count == 1
+    assert mock_request.call_args[0][:2] == (40.8, -73.97)
+    assert hass.states.get("weather.here_weather_forecast_7days_simple").state == (
+        "snowy"
+    )
+    assert hass.states.get("weather.nearby_forecast_7days_simple").state == "snowy"
+
+
+async def test_fresh_results_of_nearby_entries_are_reused(hass):
+    """Test that a fresh result of the same bucket is reused without a request."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_LOCATION_PRECISION: 2}}
+    )
+    first_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    first_entry.add_to_hass(hass)
+    nearby_entry = MockConfigEntry(domain=DOMAIN, data=NEARBY_CONFIG)
+    nearby_entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(first_entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 1
+
+        await hass.config_entries.async_setup(nearby_entry.entry_id)
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 1
+
+    first = hass.data[DOMAIN][first_entry.entry_id].data
+    nearby = hass.data[DOMAIN][nearby_entry.entry_id].data
+    assert (
+        first[(MOCK_LOCATION_ID, DEFAULT_MODE)]
+        is nearby[("40.80031_-73.971206", DEFAULT_MODE)]
+    )
+
+
+async def test_unloading_an_entry_drops_the_results_of_its_bucket(hass):
+    """Test that the results kept for the bucket of an unloaded entry are dropped."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_LOCATION_PRECISION: 2}}
+    )
+    first_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    first_entry.add_to_hass(hass)
+    nearby_entry = MockConfigEntry(domain=DOMAIN, data=NEARBY_CONFIG)
+    nearby_entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(first_entry.entry_id)
+        await hass.async_block_till_done()
+        assert await hass.config_entries.async_unload(first_entry.entry_id)
+        await hass.async_block_till_done()
+
+        await hass.config_entries.async_setup(nearby_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_request.call_count == 2
+
+
+async def test_entries_are_not_shared_without_precision(hass):
+    """Test that nearby entries are fetched separately without a precision."""
+    MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG).add_to_hass(hass)
+    MockConfigEntry(domain=DOMAIN, data=NEARBY_CONFIG).add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+
+    assert sorted(call[0][:2] for call in mock_request.call_args_list) == [
+        (40.79962, -73.970314),
+        (40.80031, -73.971206),
+    ]
@@ -0,0 +1,132 @@
+"""Tests for the parsed records of the here_weather integration."""
+from datetime import timedelta
+
+import aiohere
+
+from custom_components.here_weather import extract_data_from_payload_for_product_type
+from custom_components.here_weather.const import (
+    MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
+    MODE_OBSERVATION,
+)
+from custom_components.here_weather.model import (
+    HEREWeatherRecord,
+    HEREWeatherTimeIndex,
+    diff_records,
+)
+
+from .const import (
+    daily_simple_forecasts_response,
+    hourly_response,
+    observation_response,
+)
+
+
+def test_record_from_daily_simple_payload():
+    """Test that a daily simple payload is parsed into typed records."""
+    records = extract_data_from_payload_for_product_type(
+        daily_simple_forecasts_response,
+        aiohere.WeatherProductType[MODE_DAILY_SIMPLE],
+    )
+
+    record = records[0]
+    assert record.condition == "snowy"
+    assert record.temperature == -3.8
+    assert record.high_temperature == -3.8
+    assert record.low_temperature == -6.9
+    assert record.pressure == 1009.67
+    assert record.wind_bearing == 263
+    assert record.visibility is None
+    assert record.attributes["humidity"] == 66
+    assert record.attributes["highTemperature"] == -3.8
+    assert record.attributes["description"] == "Light snow. Morning clouds. Cold."
+
+
+def test_record_from_observation_payload():
+    """Test that observation specific attributes are kept."""
+    records = extract_data_from_payload_for_product_type(
+        observation_response,
+        aiohere.WeatherProductType[MODE_OBSERVATION],
+    )
+
+    assert records[0].temperature == -8.28
+    assert records[0].visibility == 16.09
+    assert records[0].attributes["barometerTrend"] == "Rising"
+
+
+def test_record_normalizes_placeholders():
+    """Test that HERE placeholders and missing values are converted to None."""
+    record = HEREWeatherRecord.from_element(
+        {"temperature": "*", "windSpeed": "12.5", "humidity": "*"}, MODE_HOURLY
+    )
+
+    assert record.temperature is None
+    assert record.high_temperature is None
+    assert record.wind_speed == 12.5
+    assert record.precipitation is None
+    assert record.attributes["humidity"] is None
+    assert record.attributes["description"] is None
+
+
+def test_diff_records():
+    """Test that only the values which differ are reported."""
+    old = extract_data_from_payload_for_product_type(
+        daily_simple_forecasts_response,
+        aiohere.WeatherProductType[MODE_DAILY_SIMPLE],
+    )
+    new = extract_data_from_payload_for_product_type(
+        daily_simple_forecasts_response,
+        aiohere.WeatherProductType[MODE_DAILY_SIMPLE],
+    )
+    assert diff_records(old, new) == set()
+
+    new[1].attributes["humidity"] = 99
+    new[2].attributes["iconName"] = "sunny"
+    assert diff_records(old, new) == {(1, "humidity"), (2, "iconName")}
+
+    assert (len(old) - 1, "humidity") in diff_records(old, new[:-1])
+    assert (0, "humidity") in diff_records(None, new)
+
+
+def test_time_index_with_gaps():
+    """Test that a record stays valid until the next one, also across gaps."""
+    records = extract_data_from_payload_for_product_type(
+        hourly_response, aiohere.WeatherProductType[MODE_HOURLY]
+    )
+    with_gap = [records[2], records[0], records[5]]
+    time_index = HEREWeatherTimeIndex(with_gap)
+
+    assert time_index.at(records[0].time) is records[0]
+    assert time_index.at(records[3].time) is records[2]
+    assert time_index.at(records[0].time - timedelta(minutes=1)) is None
+    assert time_index.at(records[10].time) is records[5]
+    assert time_index.between(records[1].time, records[5].time) == [
+        records[2],
+        records[5],
+    ]
+
+    interpolated = time_index.at(records[3].time, interpolate=True)
+    assert interpolated.time == records[3].time
+    assert interpolated.temperature == round(
+        records[2].temperature + (records[5].temperature - records[2].temperature) / 3,
+        2,
+    )
+
+
+def test_time_index_roll_forward():
+    """Test that the records start at the one valid at the given time."""
+    records = extract_data_from_payload_for_product_type(
+        hourly_response, aiohere.WeatherProductType[MODE_HOURLY]
+    )
+    time_index = HEREWeatherTimeIndex(records)
+    half_past = records[2].time + timedelta(minutes=30)
+
+    assert time_index.roll_forward(records[0].time - timedelta(hours=1)) == records
+    assert time_index.roll_forward(half_past) == records[2:]
+
+    rolled = time_index.roll_forward(half_past, interpolate=True)
+    assert rolled[1:] == records[3:]
+    assert rolled[0].time == half_past
+    assert rolled[0].attributes["temperature"] == round(
+        (records[2].temperature + records[3].temperature) / 2, 2
+    )
@@ -0,0 +1,153 @@
+"""Tests for the rate limiter of the here_weather integration."""
+from datetime import timedelta
+import hashlib
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_API_KEY, CONF_LATITUDE
+from homeassistant.helpers import entity_registry
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.here_weather.const import (
+    CONF_MONTHLY_QUOTA,
+    CONF_REQUESTS_PER_MINUTE,
+    DOMAIN,
+)
+from custom_components.here_weather.rate_limit import (
+    HERERateLimitExceeded,
+    async_get_rate_limiter,
+)
+
+from . import mock_weather_for_coordinates
+from .const import MOCK_CONFIG
+
+
+@pytest.fixture
+def mock_sleep():
+    """Patch sleeping and freeze the clock of the rate limiter."""
+    with patch("asyncio.sleep") as mock_sleep, patch(
+        "custom_components.here_weather.rate_limit.time.monotonic", return_value=0
+    ):
+        yield mock_sleep
+
+
+def _delays(mock_sleep) -> list[float]:
+    """Return the delays the rate limiter waited for."""
+    return [call.args[0] for call in mock_sleep.call_args_list if call.args[0]]
+
+
+async def test_requests_are_throttled_when_the_bucket_is_empty(hass, mock_sleep):
+    """Test that a request exceeding the rate waits for its token."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_REQUESTS_PER_MINUTE: 60}}
+    )
+    rate_limiter = await async_get_rate_limiter(hass, "test")
+    for _ in range(60):
+        await rate_limiter.async_acquire()
+    assert _delays(mock_sleep) == []
+
+    await rate_limiter.async_acquire()
+    await rate_limiter.async_acquire()
+
+    assert _delays(mock_sleep) == [1, 2]
+    assert rate_limiter.counters == {"requests": 62, "throttled": 2, "rejected": 0}
+
+
+async def test_requests_are_rejected_after_the_maximum_delay(hass, mock_sleep):
+    """Test that a request which would wait too long is rejected."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_REQUESTS_PER_MINUTE: 1}}
+    )
+    rate_limiter = await async_get_rate_limiter(hass, "test")
+    await rate_limiter.async_acquire()
+
+    with pytest.raises(HERERateLimitExceeded):
+        await rate_limiter.async_acquire()
+
+    assert _delays(mock_sleep) == []
+    assert rate_limiter.counters == {"requests": 1, "throttled": 0, "rejected": 1}
+
+
+async def test_monthly_quota(hass, hass_storage, freezer, mock_sleep):
+    """Test that requests beyond the monthly quota are rejected until next month."""
+    freezer.move_to("2023-01-31 12:00:00+00:00")
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_MONTHLY_QUOTA: 2}})
+    rate_limiter = await async_get_rate_limiter(hass, "test")
+    await rate_limiter.async_acquire()
+    await rate_limiter.async_acquire()
+    assert rate_limiter.quota_remaining == 0
+
+    with pytest.raises(HERERateLimitExceeded):
+        await rate_limiter.async_acquire()
+    assert rate_limiter.counters == {"requests": 2, "throttled": 0, "rejected": 1}
+
+    freezer.move_to("2023-02-01 00:00:00+00:00")
+    await rate_limiter.async_acquire()
+    assert rate_limiter.counters == {"requests": 1, "throttled": 0, "rejected": 0}
+    assert rate_limiter.quota_remaining == 1
+
+
+async def test_counters_are_restored(hass, hass_storage):
+    """Test that the counters of the current month survive a restart."""
+    key = f"{DOMAIN}.rate_limit.{hashlib.sha256(b'test').hexdigest()[:16]}"
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        "data": {
+            "month": dt_util.utcnow().strftime("%Y-%m"),
+            "counters": {"requests": 10, "throttled": 1, "rejected": 0},
+        },
+    }
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    rate_limiter = await async_get_rate_limiter(hass, "test")
+    assert rate_limiter.counters == {"requests": 10, "throttled": 1, "rejected": 0}
+
+    await rate_limiter.async_acquire()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["counters"]["requests"] == 11
+    assert "test" not in str(hass_storage[key])
+
+
+async def test_entries_share_the_rate_limiter_of_their_key(hass):
+    """Test that entries and the config flow count against the same API key."""
+    registry = entity_registry.async_get(hass)
+    registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "40.79962_-73.970314_api_requests",
+        suggested_object_id="here_weather_api_requests",
+        disabled_by=None,
+    )
+    MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG).add_to_hass(hass)
+    MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 1},
+    ).add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+        assert hass.states.get("sensor.here_weather_api_requests").state == "2"
+
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {**MOCK_CONFIG, CONF_LATITUDE: MOCK_CONFIG[CONF_LATITUDE] + 2},
+        )
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.here_weather_api_requests").state == "4"
+    rate_limiter = await async_get_rate_limiter(hass, MOCK_CONFIG[CONF_API_KEY])
+    assert rate_limiter.counters["requests"] == 4
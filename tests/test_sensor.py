@@ -1,65 +1,89 @@
 """Tests for the here_weather sensor platform."""
+import copy
 from datetime import timedelta
 from unittest.mock import patch
 
 import aiohere
 import homeassistant.util.dt as dt_util
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.entity import Entity
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_capture_events,
     async_fire_time_changed,
 )
 
-from custom_components.here_weather.const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from custom_components.here_weather.const import (
+    ATTR_DATA_AGE,
+    CONF_NOWCAST,
+    CONF_NOWCAST_INTERPOLATE,
+    CONF_OFFSETS,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+    MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
+    PAYLOAD_KEYS,
+)
 
-from . import mock_weather_for_coordinates
-from .const import MOCK_CONFIG
+from . import enable_sensors_for_all_modes, mock_weather_for_coordinates
+from .const import (
+    MOCK_CONFIG,
+    MOCK_LOCATION_ID,
+    daily_simple_forecasts_response,
+    hourly_response,
+)
 
 
-async def test_sensor_invalid_request(hass):
-    """Test that sensor value is unavailable after an invalid request."""
-    utcnow = dt_util.utcnow()
-    # Patching 'utcnow' to gain more control over the timed update.
-    with patch("homeassistant.util.dt.utcnow", return_value=utcnow):
-        with patch(
-            "aiohere.AioHere.weather_for_coordinates",
-            side_effect=mock_weather_for_coordinates,
-        ):
-            entry = MockConfigEntry(
-                domain=DOMAIN,
-                data=MOCK_CONFIG,
-            )
-            entry.add_to_hass(hass)
-
-            registry = entity_registry.async_get(hass)
-
-            # Pre-create registry entries for disabled by default sensors
-            registry.async_get_or_create(
-                "sensor",
-                DOMAIN,
-                "40.79962_-73.970314_forecast_7days_simple_windspeed_0",
-                suggested_object_id="here_weather_forecast_7days_simple_windspeed_0",
-                disabled_by=None,
-            )
-
-            await hass.config_entries.async_setup(entry.entry_id)
+async def test_sensor_invalid_request(hass, freezer):
+    """Test that the last value is served until it exceeds max staleness."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    # Pre-create registry entries for disabled by default sensors
+    entity_registry.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "40.79962_-73.970314_forecast_7days_simple_windspeed_0",
+        suggested_object_id="here_weather_forecast_7days_simple_windspeed_0",
+        disabled_by=None,
+    )
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        sensor = hass.states.get(
+            "sensor.here_weather_forecast_7days_simple_windspeed_0"
+        )
+        assert sensor.state == "22.22"
+        assert ATTR_DATA_AGE not in sensor.attributes
+        fetched = dt_util.utcnow()
 
-            await hass.async_block_till_done()
+        mock_request.side_effect = aiohere.HereInvalidRequestError("Invalid")
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        stale_since = coordinator._stale_since((MOCK_LOCATION_ID, MODE_DAILY_SIMPLE))
+        freezer.move_to(stale_since)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        assert mock_request.call_count == 2
+        sensor = hass.states.get(
+            "sensor.here_weather_forecast_7days_simple_windspeed_0"
+        )
+        assert sensor.state == "22.22"
+        assert sensor.attributes[ATTR_DATA_AGE] == round(
+            (stale_since - fetched).total_seconds()
+        )
 
-            sensor = hass.states.get(
-                "sensor.here_weather_forecast_7days_simple_windspeed_0"
-            )
-            assert sensor.state == "22.22"
-        with patch(
-            "aiohere.AioHere.weather_for_coordinates",
-            side_effect=aiohere.HereInvalidRequestError("Invalid"),
-        ):
-            async_fire_time_changed(hass, utcnow + timedelta(DEFAULT_SCAN_INTERVAL * 2))
-            await hass.async_block_till_done()
-            sensor = hass.states.get(
-                "sensor.here_weather_forecast_7days_simple_windspeed_0"
-            )
-            assert sensor.state == "unavailable"
+        freezer.move_to(
+            stale_since + timedelta(minutes=DEFAULT_MAX_STALENESS, seconds=1)
+        )
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+        sensor = hass.states.get(
+            "sensor.here_weather_forecast_7days_simple_windspeed_0"
+        )
+        assert sensor.state == "unavailable"
 
 
 async def test_forecast_astronomy(hass):
@@ -110,3 +134,139 @@ async def test_forecast_astronomy(hass):
         assert sunset.state == "2022-12-25T15:29:00+00:00"
         utc_time = hass.states.get("sensor.here_weather_forecast_astronomy_utc_time_0")
         assert utc_time.state == "2022-12-24T23:00:00+00:00"
+
+
+async def test_unchanged_refresh_writes_no_state(hass, freezer):
+    """Test that refreshes without new values neither write nor change states."""
+    enable_sensors_for_all_modes(hass)
+    entity_registry.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "40.79962_-73.970314_forecast_7days_simple_humidity_0",
+        suggested_object_id="here_weather_forecast_7days_simple_humidity_0",
+        disabled_by=None,
+    )
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        state_changes = async_capture_events(hass, EVENT_STATE_CHANGED)
+        mock_request.reset_mock()
+
+        with patch.object(Entity, "async_write_ha_state", autospec=True) as mock_write:
+            await coordinator.async_refresh()
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        assert mock_request.call_count == 2
+        assert mock_write.call_count == 0
+        assert state_changes == []
+
+        changed_response = copy.deepcopy(daily_simple_forecasts_response)
+        changed_response["dailyForecasts"][0]["forecasts"][0]["humidity"] = "99"
+
+        def _changed_humidity(*args, **kwargs):
+            response = mock_weather_for_coordinates(*args, **kwargs)
+            if PAYLOAD_KEYS[MODE_DAILY_SIMPLE] in response:
+                response.update(changed_response)
+            return response
+
+        mock_request.side_effect = _changed_humidity
+        freezer.tick(timedelta(days=2))
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in state_changes] == [
+        "sensor.here_weather_forecast_7days_simple_humidity_0"
+    ]
+
+
+async def test_sensors_for_offsets(hass):
+    """Test that sensors are created for the configured offsets of a mode."""
+    registry = entity_registry.async_get(hass)
+    for offset in (0, 5):
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"40.79962_-73.970314_forecast_hourly_temperature_{offset}",
+            suggested_object_id=f"here_weather_forecast_hourly_temperature_{offset}",
+            disabled_by=None,
+        )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={CONF_OFFSETS[MODE_HOURLY]: [0, 5, 200]},
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    forecasts = hourly_response["hourlyForecasts"][0]["forecasts"]
+    for offset in (0, 5):
+        state = hass.states.get(
+            f"sensor.here_weather_forecast_hourly_temperature_{offset}"
+        )
+        assert state.state == str(forecasts[offset]["temperature"])
+    assert registry.async_get_entity_id(
+        "sensor", DOMAIN, "40.79962_-73.970314_forecast_hourly_temperature_200"
+    )
+    # Only the values of the configured offsets are kept
+    values = hass.data[DOMAIN][entry.entry_id].values[(MOCK_LOCATION_ID, MODE_HOURLY)]
+    assert {offset for _, offset in values} == {0, 5}
+
+
+async def test_nowcast_rolls_the_hourly_forecast_forward(hass, freezer):
+    """Test that the hourly sensors follow the current hour without requests."""
+    freezer.move_to("2022-12-18T06:40:00+00:00")
+    registry = entity_registry.async_get(hass)
+    for offset in (0, 1):
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"40.79962_-73.970314_forecast_hourly_temperature_{offset}",
+            suggested_object_id=f"here_weather_forecast_hourly_temperature_{offset}",
+            disabled_by=None,
+        )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={
+            CONF_OFFSETS[MODE_HOURLY]: [0, 1],
+            CONF_NOWCAST: True,
+            CONF_NOWCAST_INTERPOLATE: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        mock_request.reset_mock()
+
+        freezer.move_to("2022-12-18T06:50:00+00:00")
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+    assert mock_request.call_count == 0
+    forecasts = hourly_response["hourlyForecasts"][0]["forecasts"]
+    temperature = hass.states.get("sensor.here_weather_forecast_hourly_temperature_0")
+    assert temperature.state == str(
+        round(
+            forecasts[0]["temperature"]
+            + (forecasts[1]["temperature"] - forecasts[0]["temperature"]) * 5 / 6,
+            2,
+        )
+    )
+    temperature = hass.states.get("sensor.here_weather_forecast_hourly_temperature_1")
+    assert temperature.state == str(forecasts[1]["temperature"])
@@ -0,0 +1,112 @@
+"""Tests for the services of the here_weather integration."""
+from unittest.mock import patch
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.here_weather.const import DOMAIN
+from custom_components.here_weather.services import (
+    ATTR_DATETIME,
+    ATTR_END,
+    ATTR_INTERPOLATE,
+    EVENT_FORECAST_AT,
+    SERVICE_GET_FORECAST_AT,
+)
+
+from . import mock_weather_for_coordinates
+from .const import MOCK_CONFIG
+
+HOURLY_ENTITY_ID = "weather.here_weather_forecast_hourly"
+
+
+@pytest.fixture
+async def hourly_weather(hass):
+    """Set up an entry with the hourly weather entity enabled."""
+    entity_registry.async_get(hass).async_get_or_create(
+        "weather",
+        DOMAIN,
+        "40.79962_-73.970314_forecast_hourly",
+        suggested_object_id="here_weather_forecast_hourly",
+        disabled_by=None,
+    )
+    MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG).add_to_hass(hass)
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        await hass.config_entries.async_setup(
+            hass.config_entries.async_entries(DOMAIN)[0].entry_id
+        )
+        await hass.async_block_till_done()
+
+
+async def _get_forecast_at(hass, **data) -> list[dict]:
+    """Call the service and return the forecast of its response event."""
+    events = async_capture_events(hass, EVENT_FORECAST_AT)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_FORECAST_AT,
+        {ATTR_ENTITY_ID: HOURLY_ENTITY_ID, **data},
+        blocking=True,
+    )
+    assert len(events) == 1
+    return events[0].data["forecast"]
+
+
+async def test_get_forecast_at(hass, hourly_weather):
+    """Test that the forecast valid at a time is returned."""
+    forecast = await _get_forecast_at(
+        hass, **{ATTR_DATETIME: "2022-12-18T07:30:00+00:00"}
+    )
+
+    assert [
+        (item["datetime"].isoformat(), item["native_temperature"]) for item in forecast
+    ] == [("2022-12-18T07:00:00+00:00", -5.9)]
+    assert await _get_forecast_at(hass, **{ATTR_DATETIME: "2022-12-01T00:00:00"}) == []
+
+
+async def test_get_forecast_at_interpolated(hass, hourly_weather):
+    """Test that the forecast between two hours can be interpolated."""
+    (forecast,) = await _get_forecast_at(
+        hass,
+        **{ATTR_DATETIME: "2022-12-18T06:30:00+00:00", ATTR_INTERPOLATE: True},
+    )
+
+    assert forecast["datetime"].isoformat() == "2022-12-18T06:30:00+00:00"
+    assert forecast["native_temperature"] == -5.85
+    assert forecast["native_wind_speed"] == 23.2
+    assert forecast["precipitation_probability"] == 22
+    assert forecast["condition"] == "snowy"
+
+
+async def test_get_forecast_in_range(hass, hourly_weather):
+    """Test that all forecasts starting within a range are returned."""
+    forecast = await _get_forecast_at(
+        hass,
+        **{
+            ATTR_DATETIME: "2022-12-18T06:00:00+00:00",
+            ATTR_END: "2022-12-18T08:00:00+00:00",
+        },
+    )
+
+    assert [item["datetime"].hour for item in forecast] == [6, 7, 8]
+
+
+async def test_get_forecast_at_requires_a_here_weather_entity(hass, hourly_weather):
+    """Test that only HERE weather entities are accepted."""
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_FORECAST_AT,
+            {
+                ATTR_ENTITY_ID: "weather.here_weather_forecast_7days",
+                ATTR_DATETIME: "2022-12-18T06:00:00+00:00",
+            },
+            blocking=True,
+        )
@@ -1,14 +1,31 @@
 """Tests for the here_weather weather platform."""
-from unittest.mock import patch
+import copy
+from datetime import timedelta
+from enum import IntFlag
+from unittest.mock import AsyncMock, patch
 
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 from homeassistant.helpers import entity_registry
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM
-from pytest_homeassistant_custom_component.common import MockConfigEntry
-
-from custom_components.here_weather.const import DOMAIN
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.here_weather.const import (
+    DOMAIN,
+    MODE_DAILY,
+    MODE_DAILY_SIMPLE,
+    MODE_HOURLY,
+)
+from custom_components.here_weather.weather import (
+    WeatherEntityFeature,
+    HEREDestinationWeather,
+)
 
 from . import mock_weather_for_coordinates
+from .const import MOCK_CONFIG
 
 
 async def test_weather(hass):
@@ -107,3 +124,124 @@ async def test_weather_observation(hass):
 
         sensor = hass.states.get("weather.here_weather_observation")
         assert sensor.state == "snowy"
+
+
+async def test_forecast_is_cached_between_updates(hass):
+    """Test that the forecast is only built again after a coordinator update."""
+    build_forecast = HEREDestinationWeather._build_forecast
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ), patch.object(
+        HEREDestinationWeather,
+        "_build_forecast",
+        autospec=True,
+        side_effect=build_forecast,
+    ) as mock_build_forecast:
+        entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        entity = hass.data["weather"].get_entity(
+            "weather.here_weather_forecast_7days_simple"
+        )
+        forecast = await entity.async_forecast_daily()
+        assert len(forecast) == 7
+        assert await entity.async_forecast_daily() is forecast
+        assert await entity.async_forecast_daily() is forecast
+        build_count = mock_build_forecast.call_count
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(days=2))
+        await hass.async_block_till_done()
+
+        # Unchanged data is not written, the forecast is built when requested
+        assert mock_build_forecast.call_count == build_count
+        assert await entity.async_forecast_daily() is not forecast
+        assert await entity.async_forecast_daily() == forecast
+        assert mock_build_forecast.call_count == build_count + 1
+
+
+async def test_forecast_subscriptions(hass):
+    """Test that the forecasts are served per mode through the forecast methods."""
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ):
+        entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        entry.add_to_hass(hass)
+        registry = entity_registry.async_get(hass)
+        registry.async_get_or_create(
+            "weather",
+            DOMAIN,
+            "40.79962_-73.970314_forecast_hourly",
+            suggested_object_id="here_weather_forecast_hourly",
+            disabled_by=None,
+        )
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        hourly = hass.data["weather"].get_entity("weather.here_weather_forecast_hourly")
+        daily = hass.data["weather"].get_entity(
+            "weather.here_weather_forecast_7days_simple"
+        )
+        assert len(await hourly.async_forecast_hourly()) == 168
+        assert len(await daily.async_forecast_daily()) == 7
+
+        state = hass.states.get("weather.here_weather_forecast_7days_simple")
+        if WeatherEntityFeature is None:
+            assert len(state.attributes["forecast"]) == 7
+        else:
+            assert "forecast" not in state.attributes
+
+
+class _ForecastFeature(IntFlag):
+    """Stand-in for WeatherEntityFeature on Home Assistant < 2023.8."""
+
+    FORECAST_DAILY = 1
+    FORECAST_HOURLY = 2
+
+
+def _with_changed_daily_forecast(*args, **kwargs):
+    """Return the mock data with the high temperature of the first day raised."""
+    response = copy.deepcopy(mock_weather_for_coordinates(*args, **kwargs))
+    forecast = response["dailyForecasts"][0]["forecasts"][0]
+    forecast["highTemperature"] = str(float(forecast["highTemperature"]) + 1)
+    return response
+
+
+async def test_forecast_listeners_are_updated(hass):
+    """Test that forecast subscribers are notified on a coordinator update."""
+    feature = WeatherEntityFeature or _ForecastFeature
+    with patch(
+        "aiohere.AioHere.weather_for_coordinates",
+        side_effect=mock_weather_for_coordinates,
+    ) as mock_request, patch(
+        "custom_components.here_weather.weather.FORECAST_FEATURES",
+        {
+            MODE_HOURLY: feature.FORECAST_HOURLY,
+            MODE_DAILY: feature.FORECAST_DAILY,
+            MODE_DAILY_SIMPLE: feature.FORECAST_DAILY,
+        },
+    ), patch.object(
+        HEREDestinationWeather,
+        "async_update_listeners",
+        new_callable=AsyncMock,
+        create=True,
+    ) as mock_update_listeners:
+        entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        state = hass.states.get("weather.here_weather_forecast_7days_simple")
+        assert state.attributes["supported_features"] == feature.FORECAST_DAILY
+
+        mock_update_listeners.assert_not_called()
+
+        # Only a changed forecast is published to the subscribers
+        mock_request.side_effect = _with_changed_daily_forecast
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(days=2))
+        await hass.async_block_till_done()
+
+        mock_update_listeners.assert_called_with(None)